@@ -21,22 +21,61 @@ MAX_URLS_TO_SCRAPE = 100
 MAX_POOL_SIZE = 500  # Maximum number of URLs in the pool
 URL_RETRY_LIMIT = 3  # Number of times to retry a failed URL
 
+# Crawl only one URL per path template (e.g. /user/{id}/profile); off by default
+# because sites sometimes serve distinct content under ID-like slugs
+URL_FINGERPRINT_DEDUP = False
+
 # Request timeout in seconds
 REQUEST_TIMEOUT = 10
 
+# Page bodies are truncated past this size, in bytes (PDFs are spooled instead)
+MAX_PAGE_SIZE = 5 * 1024 * 1024
+
+# PDFs are streamed into memory and moved to a temporary file on disk past this size, in bytes
+PDF_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+PDF_CHUNK_SIZE = 64 * 1024  # Read size when streaming PDF downloads
+
+# PDF parsing runs in worker processes; None means one per CPU core
+PDF_PARSE_WORKERS = None
+MAX_CONCURRENT_PDF_PARSES = 8  # PDFs queued for or being parsed at once
+
+# Where sitemaps are cached between runs for conditional re-fetches
+SITEMAP_CACHE_DIR = 'scrapes/.sitemap_cache'
+
+# Seconds to wait before re-probing a URL whose HEAD request failed
+HEAD_FAILURE_TTL = 60
+
 # Maximum number of retries for fetching content
 MAX_RETRIES = 2
 
 # Initial delay for retry (in seconds)
 INITIAL_RETRY_DELAY = 1
 
+# Longest wait before a retry, in seconds; a longer Retry-After ends the retries
+MAX_RETRY_DELAY = 60
+
 # Rate limiting delay range (in seconds)
 RATE_LIMIT_MIN = 1
 RATE_LIMIT_MAX = 5
 
+# Maximum number of requests in flight to one domain across all scrapers
+MAX_CONCURRENT_REQUESTS_PER_DOMAIN = 4
+
 # Max number of scrapers to use
 MAX_SIMULTANEOUS_SCRAPERS = 6
 
+# How often an idle scraper checks the pool while other scrapers are still working, in seconds
+POOL_POLL_INTERVAL = 0.1
+
+# Maximum number of Firefox instances shared by all scrapers
+SELENIUM_POOL_SIZE = 2
+
+# Directory holding the persistent Firefox profiles, one per browser; '~' is expanded
+FIREFOX_PROFILE_DIR = '~/.cache/wormpy/ff_profile'
+
+# Maximum size of the persistent Firefox profile (HTTP cache etc.) before it is reset, in bytes
+FIREFOX_PROFILE_MAX_SIZE = 200 * 1024 * 1024
+
 # Proxy-related settings
 PROXY_TEST_URL = "http://httpbin.org/ip"
 MAX_PROXIES = 100 # Number of proxies to keep in rotation
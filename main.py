@@ -10,20 +10,29 @@ and orchestrates the web scraping process.
 import argparse
 import asyncio
 import time
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import os
 
+try:
+    import uvloop
+except ImportError:
+    # Optional; not available on Windows
+    uvloop = None
+
 from modules.utils.logger import configure_logging, get_logger
 from modules.utils.sitemap_parser import get_all_urls
 from modules.scraper import run_scrapers
 from modules.utils.utils import format_output, set_filename, get_scraping_stats
 from modules.utils.file_handler import save_output
 from modules.utils.url_tracker import url_tracker
+from modules.utils.http_session import close_http_session
+from modules.utils.checkpoint import CrawlCheckpoint
 from modules.processors.url_processor import (
     get_domain,
     is_valid_url,
     normalize_url,
+    normalize_and_filter_urls,
 )
 
 async def run_scraping(
@@ -31,6 +40,8 @@ async def run_scraping(
     discovery_mode: bool,
     force_scrape_method: str,
     output_format: str,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    resume: bool = False,
 ) -> Tuple[Dict[str, Any], int]:
     """
     Run the web scraping process.
@@ -40,6 +51,8 @@ async def run_scraping(
         discovery_mode (bool): Whether to scrape the entire site or just the base URL.
         force_scrape_method (str): Method to force for scraping ('req' or 'sel').
         output_format (str): The desired output format ('csv' or 'json').
+        checkpoint (Optional[CrawlCheckpoint]): Checkpoint scraped pages are recorded in.
+        resume (bool): Whether to continue from the pages already in the checkpoint.
 
     Returns:
         Tuple[Dict[str, Any], int]: A tuple containing the formatted output
@@ -47,17 +60,46 @@ async def run_scraping(
     """
     logging = get_logger(__name__)
     normalized_base_url = normalize_url(base_url)
+
+    # Pages scraped by an interrupted run are kept and not fetched again
+    resumed_results = {}
+    failed_urls = []
+    if checkpoint is not None:
+        if resume:
+            resumed_results = checkpoint.load()
+            # Pages recorded without content failed to fetch and are crawled again
+            failed_urls = [url for url, data in resumed_results.items() if data.get('content') is None]
+            for url in failed_urls:
+                del resumed_results[url]
+        else:
+            checkpoint.reset()
+    for url in resumed_results:
+        url_tracker.mark_visited(url)
     
     # Initialize URL pool with base URL and sitemap URLs if in discovery mode
-    await url_tracker.add_to_pool(normalized_base_url)
+    url_tracker.add_to_pool(normalized_base_url)
     sitemap_urls = []
-    if discovery_mode:
-        # Fetch sitemap
-        sitemap_urls = get_all_urls(base_url)
-        logging.info(f"Sitemap fetched. Total URLs in sitemap: {len(sitemap_urls)}")
-        await url_tracker.add_bulk_to_pool(sitemap_urls)
-
-    results = await run_scrapers(base_url, discovery_mode, force_scrape_method)
+    try:
+        if discovery_mode:
+            # Fetch sitemap
+            sitemap_urls = await get_all_urls(base_url)
+            logging.info(f"Sitemap fetched. Total URLs in sitemap: {len(sitemap_urls)}")
+            # Queue sitemap URLs in normalized form, like discovered links, so variants of one page are queued once
+            url_tracker.add_bulk_to_pool(normalize_and_filter_urls(sitemap_urls, normalized_base_url))
+
+            if resumed_results or failed_urls:
+                # Rebuild the frontier from the links found on the pages already scraped
+                resumed_urls = set(failed_urls)
+                for data in resumed_results.values():
+                    resumed_urls.update(normalize_and_filter_urls(data.get('discovered_urls', []), normalized_base_url))
+                url_tracker.add_bulk_to_pool(resumed_urls)
+
+        results = await run_scrapers(base_url, discovery_mode, force_scrape_method, checkpoint=checkpoint)
+        results = {**resumed_results, **results}
+    finally:
+        await close_http_session()
+        if checkpoint is not None:
+            checkpoint.close()
 
     formatted_output = format_output(results, output_format)
     total_urls_scraped = len(results)
@@ -73,6 +115,21 @@ async def run_scraping(
 
     return formatted_output, total_urls_scraped
 
+def run_event_loop(coroutine):
+    """
+    Run a coroutine to completion on a new event loop, using uvloop when it is installed.
+
+    Args:
+        coroutine: The coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    if uvloop is not None and hasattr(asyncio, 'Runner'):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coroutine)
+    return asyncio.run(coroutine)
+
 def main() -> None:
     """
     Main function to run the web scraper.
@@ -101,11 +158,21 @@ def main() -> None:
         default='json',
         help="Specify the output format (csv or json)"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent JSON output for readability"
+    )
     parser.add_argument(
         "--force",
         choices=['req', 'sel'],
         help="Force scraping with either requests or selenium"
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted scrape from its checkpoint"
+    )
     args = parser.parse_args()
     
     base_url = normalize_url(args.url)
@@ -117,6 +184,8 @@ def main() -> None:
         "force_scrape_method": args.force,
         "log_level": args.log,
         "output_format": args.format,
+        "pretty": args.pretty,
+        "resume": args.resume,
         "save_directory": args.savename or get_domain(base_url),
     }
 
@@ -124,6 +193,7 @@ def main() -> None:
     now = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_filename = f"scrape_log_{now}.log"
     log_filepath = os.path.join('scrapes', config['save_directory'], log_filename)
+    checkpoint = CrawlCheckpoint(os.path.join('scrapes', config['save_directory'], 'checkpoint.jsonl'))
 
     configure_logging(log_level=args.log, log_file=log_filepath, use_json=False)
     logging = get_logger(__name__)
@@ -136,17 +206,19 @@ def main() -> None:
 
         logging.info("Starting web scraping process...")
 
-        formatted_output, total_urls_scraped = asyncio.run(
-            run_scraping(base_url, args.discovery, args.force, args.format)
+        formatted_output, total_urls_scraped = run_event_loop(
+            run_scraping(base_url, args.discovery, args.force, args.format, checkpoint=checkpoint, resume=args.resume)
         )
 
         filename = set_filename(args.format, now)
         folder_name = args.savename or get_domain(base_url)
-        full_filepath = save_output(formatted_output, folder_name, filename, args.format)
+        full_filepath = save_output(formatted_output, folder_name, filename, args.format, pretty=args.pretty)
 
         logging.info(f"Scraping complete. Saved output to {full_filepath}.")
+        # The output now holds every page, so the crawl no longer needs resuming
+        checkpoint.remove()
         
-        stats = asyncio.run(get_scraping_stats())
+        stats = get_scraping_stats()
         logging.debug(f"Scraping statistics: {stats}")
         logging.info(f"Total URLs scraped: {total_urls_scraped}")
 
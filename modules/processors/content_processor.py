@@ -1,63 +1,118 @@
 # content_processor.py
 
-import requests
-import io
 import asyncio
-import PyPDF2
+import aiohttp
+import contextlib
 import json
+import random
+import time
+from email.utils import parsedate_to_datetime
 from typing import Tuple, List, Optional, Dict, Any
 from bs4 import BeautifulSoup
-from .url_processor import is_pdf_url, extract_urls
-from ..utils.utils import get_pdf_data
+from .url_processor import is_pdf_url, extract_urls, get_domain
+from .pdf_processor import spool_response, extract_pdf
+from ..utils.http_session import get_http_session
 #from ..utils.url_tracker import url_tracker
-from config import HEADERS, REQUEST_TIMEOUT, MAX_RETRIES, INITIAL_RETRY_DELAY
+from config import REQUEST_TIMEOUT, MAX_RETRIES, INITIAL_RETRY_DELAY, MAX_RETRY_DELAY, MAX_PAGE_SIZE
 
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
 
+# BeautifulSoup tree builder; lxml's C parser is several times faster than the pure-Python 'html.parser'
+SOUP_PARSER = 'lxml'
+
+# Client errors worth retrying; any other 4xx response is final
+RETRYABLE_CLIENT_STATUSES = frozenset((408, 429))
+
+# Read size when streaming page bodies
+PAGE_CHUNK_SIZE = 64 * 1024
+
 async def process_page(
     scraper_id: int,
     url: str,
     force_scrape_method: Optional[str] = None,
-    selenium_driver: Any = None
-) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[Dict[str, Any]], List[str]]:
+    selenium_driver: Any = None,
+    rate_limiter: Any = None
+) -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]], List[str]]:
     """
     Process a page by fetching its content and extracting relevant information.
 
+    The raw page body is not returned, so it can be freed as soon as the text,
+    metadata and links have been extracted from it.
+
     Args:
         scraper_id (int): The ID of the scraper processing this page.
         url (str): The URL of the page to process.
         force_scrape_method (str, optional): Force a specific scraping method ('req' or 'sel').
-        selenium_driver (SeleniumDriver, optional): Instance of SeleniumDriver for Selenium operations.
+        selenium_driver (SeleniumPool, optional): Pool of Selenium drivers for Selenium operations.
+        rate_limiter (AsyncRateLimiter, optional): Rate limiter for the page's requests, also notified
+            when the server asks us to back off.
 
     Returns:
-        tuple: A tuple containing content, content type, extracted text, metadata, and discovered URLs.
+        tuple: A tuple containing content type, extracted text, metadata, and discovered URLs.
     """
     try:
-        content, content_type, fetched_urls = await fetch_page(scraper_id, url, force_scrape_method, selenium_driver=selenium_driver)
+        content, content_type, fetched_urls = await fetch_page(
+            scraper_id, url, force_scrape_method, selenium_driver=selenium_driver, rate_limiter=rate_limiter
+        )
 
-        # Convert content to string if it's bytes
-        if isinstance(content, bytes):
-            content = content.decode('utf-8', errors='replace')
+        if await is_pdf_response(url, content_type):
+            # Parse the body that was already downloaded; only a page source string needs a re-fetch
+            pdf_source = url if content is None or isinstance(content, str) else content
+            try:
+                extracted_text, pdf_metadata = await extract_pdf(pdf_source)
+            finally:
+                if hasattr(content, 'close'):
+                    content.close()
+            metadata = {'url': url, 'content_type': content_type, **pdf_metadata}
+            return content_type, extracted_text, metadata, []
+
+        # Parsing is CPU-bound; run it in a worker thread so the event loop keeps serving other fetches
+        extracted_text, metadata, discovered_urls = await asyncio.to_thread(
+            extract_page, scraper_id, url, content, content_type, fetched_urls
+        )
+        return content_type, extracted_text, metadata, discovered_urls
+    except Exception as e:
+        logging.error("Scraper %d: Error processing %s: %s", scraper_id, url, str(e))
+        return None, None, None, []
 
-        # Extract metadata
-        metadata = extract_metadata(content, content_type, url)
+def extract_page(
+    scraper_id: int,
+    url: str,
+    content: Any,
+    content_type: str,
+    fetched_urls: List[str]
+) -> Tuple[str, Dict[str, Any], List[str]]:
+    """
+    Extract the text, metadata and links of a fetched non-PDF page.
 
-        # Extract text
-        if content_type.lower().startswith('text/html'):
-            extracted_text = extract_text_from_html(content)
-        elif content_type.lower() == 'application/pdf' or is_pdf_url(url):
-            extracted_text = extract_text_from_pdf(url)
-        else:
-            extracted_text = f"Scraper {scraper_id}: Unsupported content type: {content_type}"
+    Args:
+        scraper_id (int): The ID of the scraper processing this page.
+        url (str): The URL of the page.
+        content (Any): The page body, as bytes or an already decoded string.
+        content_type (str): The content type of the page.
+        fetched_urls (List[str]): Links already collected while fetching (e.g. by Selenium), if any.
 
-        # Extract URLs
-        discovered_urls = fetched_urls if fetched_urls else extract_urls(content, url, content_type)
+    Returns:
+        tuple: A tuple containing the extracted text, metadata, and discovered URLs.
+    """
+    # Convert content to string if it's bytes
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
 
-        return content, content_type, extracted_text, metadata, discovered_urls
-    except Exception as e:
-        logging.error("Scraper %d: Error processing %s: %s", scraper_id, url, str(e))
-        return None, None, None, None, []
+    if content_type.lower().startswith('text/html'):
+        # Parse once for both; metadata must be read first since text extraction prunes the tree
+        soup = BeautifulSoup(content, SOUP_PARSER)
+        metadata = extract_metadata(content, content_type, url, soup=soup)
+        extracted_text = extract_text_from_html(content, soup=soup)
+    else:
+        metadata = extract_metadata(content, content_type, url)
+        extracted_text = f"Scraper {scraper_id}: Unsupported content type: {content_type}"
+
+    # Extract URLs
+    discovered_urls = fetched_urls if fetched_urls else extract_urls(content, url, content_type)
+
+    return extracted_text, metadata, discovered_urls
 
 async def fetch_page(
     scraper_id: int,
@@ -65,24 +120,34 @@ async def fetch_page(
     force_scrape_method: Optional[str] = None,
     max_retries: int = MAX_RETRIES,
     initial_delay: float = INITIAL_RETRY_DELAY,
-    selenium_driver: Any = None
+    selenium_driver: Any = None,
+    rate_limiter: Any = None
 ) -> Tuple[Optional[bytes], str, List[str]]:
     """
     Fetch page content, trying static first and then dynamic if needed.
 
+    Each request holds one of the domain's rate limiter slots only while it is on the
+    wire; the slot is released before the content check, retry waits and extraction.
+
+    Failed attempts are retried with jittered exponential backoff, except for client
+    errors other than 408 and 429. A Retry-After header on the error response sets
+    the minimum wait and is passed on to the rate limiter for the whole domain.
+
     Args:
         scraper_id (int): The ID of the scraper fetching the page.
         url (str): The URL to fetch.
         force_scrape_method (str, optional): Force the use of 'req' for requests or 'sel' for selenium.
         max_retries (int): Maximum number of retry attempts.
         initial_delay (float): Initial delay between retries.
-        selenium_driver (SeleniumDriver, optional): Instance of SeleniumDriver for Selenium operations.
+        selenium_driver (SeleniumPool, optional): Pool of Selenium drivers for Selenium operations.
+        rate_limiter (AsyncRateLimiter, optional): Rate limiter for the page's requests, also notified
+            when the server asks us to back off.
 
     Returns:
         tuple: A tuple containing the page content, content type, and discovered URLs.
 
     Raises:
-        Exception: If unable to fetch the page after max_retries.
+        Exception: If unable to fetch the page after max_retries, or on a non-retryable error.
     """
     for attempt in range(max_retries):
         try:
@@ -92,47 +157,204 @@ async def fetch_page(
                 logging.info("Scraper %d: Forcing Selenium for %s", scraper_id, url)
                 if selenium_driver is None:
                     raise Exception("Selenium driver not provided")
-                content, content_type, discovered_urls = await selenium_driver.fetch_with_selenium(url)
+                async with request_slot(rate_limiter, url):
+                    content, content_type, discovered_urls = await selenium_driver.fetch_with_selenium(url)
                 if content is None:
                     raise Exception("Scraper %d: Selenium fetch failed!", scraper_id)
             else:
-                # Try with requests first
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: requests.get(
-                        url,
-                        headers=HEADERS,
-                        timeout=REQUEST_TIMEOUT,
-                    )
-                )
-                response.raise_for_status()
-                content = response.content
-                content_type = response.headers.get('Content-Type', '')
+                # Try a plain HTTP fetch first, on the shared keep-alive session
+                session = await get_http_session()
+                async with request_slot(rate_limiter, url), session.get(
+                    url, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+                ) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '')
+                    if is_pdf_content_type(content_type) or (
+                        url.lower().endswith('.pdf') and not is_html_content_type(content_type)
+                    ):
+                        # PDFs can be large; stream them instead of buffering the whole body
+                        content = await spool_response(response)
+                    elif content_type and not is_text_content_type(content_type):
+                        # Nothing is extracted from other binary types, so don't download them
+                        logging.debug("Scraper %d: Skipping body of %s content at %s", scraper_id, content_type, url)
+                        content = b''
+                    else:
+                        content = await read_page_body(response)
                 discovered_urls = []
 
                 # Check if the content is likely to be dynamic
-                if force_scrape_method != 'req' and is_dynamic_content(content):
+                if (
+                    force_scrape_method != 'req' and is_html_content_type(content_type)
+                    and await asyncio.to_thread(is_dynamic_content, content)
+                ):
                     logging.debug("Scraper %d: Content seems dynamic, switching to Selenium for %s", scraper_id, url)
                     if selenium_driver is None:
                         raise Exception("Could not get Selenium driver for dynamic content")
-                    content, content_type, discovered_urls = await selenium_driver.fetch_with_selenium(url)
+                    async with request_slot(rate_limiter, url):
+                        content, content_type, discovered_urls = await selenium_driver.fetch_with_selenium(url)
                     if content is None:
                         raise Exception("Scraper %d: Selenium fetch failed!", scraper_id)
 
                 logging.info("Scraper %d: Successfully fetched content from URL: %s", scraper_id, url)
             return content, content_type, discovered_urls
-        except (requests.RequestException, Exception) as e:
+        except Exception as e:
             logging.warning("Scraper %d: Error fetching content from URL %s (attempt %d/%d): %s", 
                            scraper_id, url, attempt + 1, max_retries, str(e))
-            if attempt < max_retries - 1:
-                delay = initial_delay * (2 ** attempt)
-                logging.info("Scraper %d: Retrying in %d seconds...", scraper_id, delay)
-                await asyncio.sleep(delay)
-            else:
+            retry_after = get_retry_after(e)
+            if retry_after is not None and rate_limiter is not None:
+                rate_limiter.penalize(get_domain(url), retry_after)
+
+            if not is_retryable_error(e):
+                logging.error("Scraper %d: Not retrying URL %s: %s", scraper_id, url, str(e))
+                raise
+            if attempt >= max_retries - 1 or (retry_after is not None and retry_after > MAX_RETRY_DELAY):
                 logging.error("Scraper %d: Failed to fetch content from URL %s after %d attempts!", 
-                             scraper_id, url, max_retries)
+                             scraper_id, url, attempt + 1)
                 raise
 
-def extract_metadata(content: str, content_type: str, url: str) -> Dict[str, Any]:
+            delay = min(initial_delay * (2 ** attempt) + random.uniform(0, 1), MAX_RETRY_DELAY)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            logging.info("Scraper %d: Retrying in %.1f seconds...", scraper_id, delay)
+            await asyncio.sleep(delay)
+
+def request_slot(rate_limiter: Any, url: str):
+    """
+    Get a context manager holding the URL's domain slot in the rate limiter, if there is one.
+
+    Args:
+        rate_limiter (AsyncRateLimiter, optional): The rate limiter, or None for no limiting.
+        url (str): The URL about to be requested.
+
+    Returns:
+        An async context manager to wrap the request in.
+    """
+    if rate_limiter is None:
+        return contextlib.nullcontext()
+    return rate_limiter.limit(get_domain(url))
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Check whether a failed fetch is worth retrying.
+
+    Connection errors, timeouts, server errors and Selenium failures are treated as
+    transient; client errors are not, except for 408 (Request Timeout) and 429 (Too Many Requests).
+
+    Args:
+        error (Exception): The exception raised by the fetch.
+
+    Returns:
+        bool: True if the fetch should be retried, False otherwise.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return not (400 <= error.status < 500) or error.status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header of an HTTP error response.
+
+    Args:
+        error (Exception): The exception raised by the fetch.
+
+    Returns:
+        Optional[float]: The number of seconds the server asked us to wait, or None if
+        the error carries no valid Retry-After header.
+    """
+    headers = getattr(error, 'headers', None) if isinstance(error, aiohttp.ClientResponseError) else None
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # Otherwise an HTTP date
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+async def read_page_body(response: aiohttp.ClientResponse, max_size: int = MAX_PAGE_SIZE) -> bytes:
+    """
+    Read a response body in chunks, truncating it at max_size bytes.
+
+    Args:
+        response (aiohttp.ClientResponse): The response whose body to read.
+        max_size (int): The maximum number of bytes to keep.
+
+    Returns:
+        bytes: The body, or its first max_size bytes if it is larger.
+    """
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(PAGE_CHUNK_SIZE):
+        body.extend(chunk)
+        if len(body) >= max_size:
+            logging.warning("Response from %s exceeds %d bytes; truncating", response.url, max_size)
+            del body[max_size:]
+            break
+    return bytes(body)
+
+def is_html_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header denotes an HTML page.
+
+    Args:
+        content_type (str): The Content-Type header value.
+
+    Returns:
+        bool: True for 'text/html', with or without parameters.
+    """
+    return content_type.lower().startswith('text/html')
+
+def is_text_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header denotes a textual document.
+
+    Args:
+        content_type (str): The Content-Type header value.
+
+    Returns:
+        bool: True for text/*, XML, XHTML and JSON types.
+    """
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type.startswith('text/') or media_type.endswith(('xml', 'json'))
+
+def is_pdf_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header denotes a PDF.
+
+    Args:
+        content_type (str): The Content-Type header value.
+
+    Returns:
+        bool: True for 'application/pdf', with or without parameters.
+    """
+    return content_type.lower().startswith('application/pdf')
+
+async def is_pdf_response(url: str, content_type: str) -> bool:
+    """
+    Decide whether a fetched page is a PDF.
+
+    The Content-Type of the fetch is trusted when there is one, with a '.pdf'
+    extension also accepted for servers that send a generic binary type. A HEAD
+    request is only made when the response had no Content-Type at all.
+
+    Args:
+        url (str): The URL that was fetched.
+        content_type (str): The Content-Type returned by the fetch, possibly empty.
+
+    Returns:
+        bool: True if the page should be processed as a PDF, False otherwise.
+    """
+    if is_pdf_content_type(content_type):
+        return True
+    if content_type.lower().startswith('text/html'):
+        return False
+    if content_type:
+        return url.lower().endswith('.pdf')
+    return await is_pdf_url(url)
+
+def extract_metadata(content: str, content_type: str, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
     """
     Extract metadata from the content based on its type.
 
@@ -140,6 +362,7 @@ def extract_metadata(content: str, content_type: str, url: str) -> Dict[str, Any
         content (str): The raw content of the page.
         content_type (str): The content type of the page.
         url (str): The URL of the page.
+        soup (BeautifulSoup, optional): The page already parsed, to avoid parsing it again.
 
     Returns:
         dict: A dictionary containing the extracted metadata.
@@ -150,10 +373,11 @@ def extract_metadata(content: str, content_type: str, url: str) -> Dict[str, Any
     }
 
     if content_type.lower().startswith('text/html'):
-        soup = BeautifulSoup(content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(content, SOUP_PARSER)
 
-        # Extract title
-        metadata['title'] = soup.title.string if soup.title else None
+        # Extract title as a plain str; a NavigableString would keep the whole tree alive
+        metadata['title'] = soup.title.get_text(strip=True) if soup.title else None
 
         # Extract meta tags
         for meta in soup.find_all('meta'):
@@ -174,18 +398,9 @@ def extract_metadata(content: str, content_type: str, url: str) -> Dict[str, Any
             except json.JSONDecodeError:
                 logging.warning("Failed to parse schema.org data for %s", url)
 
-    elif content_type.lower() == 'application/pdf':
-        try:
-            pdf_file = get_pdf_data(url)
-            reader = PyPDF2.PdfReader(pdf_file)
-            if reader.metadata:
-                metadata.update(reader.metadata)
-        except Exception as e:
-            logging.error("Error extracting PDF metadata from %s: %s", url, str(e))
-
     return metadata
 
-def extract_text_from_html(html: str) -> str:
+def extract_text_from_html(html: str, soup: Optional[BeautifulSoup] = None) -> str:
     """
     Extract text content from HTML, removing unwanted elements and formatting.
 
@@ -195,6 +410,8 @@ def extract_text_from_html(html: str) -> str:
 
     Args:
         html (str): The HTML content to process.
+        soup (BeautifulSoup, optional): The page already parsed, to avoid parsing it again.
+            Unwanted elements are removed from it in place.
 
     Returns:
         str: The extracted and cleaned text content.
@@ -207,7 +424,8 @@ def extract_text_from_html(html: str) -> str:
         - ERROR: When an error occurs during extraction.
     """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html, SOUP_PARSER)
 
         # Remove script, style, and other unwanted elements
         for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
@@ -233,40 +451,6 @@ def extract_text_from_html(html: str) -> str:
         logging.error("Error extracting text from HTML content: %s", str(e))
         raise
 
-def extract_text_from_pdf(file_path_or_url: str) -> str:
-    """
-    Extract text content from a PDF file.
-
-    Args:
-        file_path_or_url (str): Local file path or URL of the PDF file
-
-    Returns:
-        str: Extracted text content as a string
-    """
-    pdf_file = None
-    try:
-        pdf_file = get_pdf_data(file_path_or_url)
-        # Create a PDF reader object
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-        # Extract text from all pages
-        text_content = "\n".join(page.extract_text() for page in pdf_reader.pages)
-
-        return text_content.strip()
-
-    except requests.RequestException as e:
-        logging.error("Error fetching PDF from URL %s: %s", file_path_or_url, str(e))
-        return f"Error fetching PDF: {str(e)}"
-    except PyPDF2.errors.PdfReadError as e:
-        logging.error("Error reading PDF %s: %s", file_path_or_url, str(e))
-        return f"Error reading PDF: {str(e)}"
-    except Exception as e:
-        logging.error("Unexpected error processing PDF %s: %s", file_path_or_url, str(e))
-        return f"Unexpected error: {str(e)}"
-    finally:
-        if pdf_file and not isinstance(pdf_file, io.BytesIO):
-            pdf_file.close()
-
 def is_dynamic_content(content: bytes) -> bool:
     """
     Check if the content is likely to be dynamic based on the amount of text.
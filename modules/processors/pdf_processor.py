@@ -0,0 +1,182 @@
+# pdf_processor.py
+
+"""
+PDF download and text extraction.
+
+PDF bodies are streamed into a spool that stays in memory for small documents and
+moves to a temporary file on disk past PDF_SPOOL_MAX_SIZE, so a large report never
+has to fit in RAM. Parsing is CPU-bound and runs in a pool of worker processes, so
+it neither blocks the event loop nor contends for the GIL; a spool on disk is handed
+to the worker by path, so its body is never read back into this process.
+"""
+
+import io
+import os
+import atexit
+import asyncio
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
+import pypdf
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+from ..utils.utils import cached_urlsplit
+from ..utils.http_session import get_http_session
+from config import REQUEST_TIMEOUT, PDF_SPOOL_MAX_SIZE, PDF_CHUNK_SIZE, PDF_PARSE_WORKERS, MAX_CONCURRENT_PDF_PARSES
+
+from modules.utils.logger import get_logger
+logging = get_logger(__name__)
+
+# Created on first use; shut down at exit
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+# Keeps a burst of PDFs from piling their bodies up in the pool's queue
+_pdf_parse_slots = asyncio.BoundedSemaphore(MAX_CONCURRENT_PDF_PARSES)
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for PDF parsing, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor: The process pool.
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        # Forking a process that runs logging and Selenium threads can deadlock the child
+        context = multiprocessing.get_context('spawn')
+        _pdf_pool = ProcessPoolExecutor(max_workers=PDF_PARSE_WORKERS, mp_context=context)
+        atexit.register(shutdown_pdf_pool)
+    return _pdf_pool
+
+def shutdown_pdf_pool() -> None:
+    """Shut down the PDF parsing pool if it was started."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(cancel_futures=True)
+        _pdf_pool = None
+
+class DiskSpool(io.FileIO):
+    """
+    A temporary file on disk that is deleted when closed.
+
+    Unlike a `tempfile.TemporaryFile`, it has a path, so a worker process can open it.
+    """
+
+    def __init__(self):
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        super().__init__(path, 'r+b')
+
+    def close(self) -> None:
+        """Close the file and delete it."""
+        try:
+            super().close()
+        finally:
+            try:
+                os.remove(self.name)
+            except OSError:
+                pass
+
+async def spool_response(response: aiohttp.ClientResponse) -> BinaryIO:
+    """
+    Stream a response body into memory, moving it to a `DiskSpool` past PDF_SPOOL_MAX_SIZE.
+
+    Args:
+        response (aiohttp.ClientResponse): The response whose body to read.
+
+    Returns:
+        BinaryIO: The body, rewound to the start. The caller must close it.
+    """
+    spool: BinaryIO = io.BytesIO()
+    try:
+        async for chunk in response.content.iter_chunked(PDF_CHUNK_SIZE):
+            if isinstance(spool, io.BytesIO) and spool.tell() + len(chunk) > PDF_SPOOL_MAX_SIZE:
+                disk_spool = DiskSpool()
+                try:
+                    disk_spool.write(spool.getbuffer())
+                except BaseException:
+                    disk_spool.close()
+                    raise
+                spool = disk_spool
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+async def fetch_pdf(url: str) -> BinaryIO:
+    """
+    Download a PDF on the shared aiohttp session into a spool.
+
+    Args:
+        url (str): The URL of the PDF.
+
+    Returns:
+        BinaryIO: The PDF body, from `spool_response`. The caller must close it.
+    """
+    session = await get_http_session()
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as response:
+        response.raise_for_status()
+        return await spool_response(response)
+
+def read_pdf(source: Union[str, bytes, BinaryIO]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse a PDF and return its text and document metadata.
+
+    This is CPU-bound; async callers should use `extract_pdf`, which runs it in the
+    PDF process pool.
+
+    Args:
+        source (Union[str, bytes, BinaryIO]): Local file path, raw bytes or a binary file object.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The text of all pages, and the document info entries as strings.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    reader = pypdf.PdfReader(source)
+    text = "\n".join(page.extract_text() or '' for page in reader.pages)
+    metadata = {key: str(value) for key, value in (reader.metadata or {}).items()}
+    return text.strip(), metadata
+
+async def extract_pdf(source: Union[str, bytes, BinaryIO]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract text and metadata from a PDF without blocking the event loop.
+
+    Args:
+        source (Union[str, bytes, BinaryIO]): URL or local file path of the PDF, its raw
+            bytes, or an already-downloaded body such as the spool from `spool_response`.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The extracted text (or an error message) and the
+        document metadata (empty on error).
+    """
+    # Don't dump raw PDF bytes into the log messages below
+    label = source if isinstance(source, str) else '<downloaded PDF>'
+    pdf_file = None
+    try:
+        async with _pdf_parse_slots:
+            if isinstance(source, str) and cached_urlsplit(source).scheme in ('http', 'https'):
+                pdf_file = source = await fetch_pdf(source)
+            if isinstance(source, DiskSpool):
+                # Let the worker open the file itself rather than sending it the whole body
+                source = source.name
+            elif not isinstance(source, (str, bytes, bytearray)):
+                # File objects can't be sent to another process; an in-memory spool is
+                # at most PDF_SPOOL_MAX_SIZE, so pass the body itself
+                source = await asyncio.to_thread(source.read)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(get_pdf_pool(), read_pdf, source)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error("Error fetching PDF from URL %s: %s", label, str(e))
+        return f"Error fetching PDF: {str(e)}", {}
+    except pypdf.errors.PdfReadError as e:
+        logging.error("Error reading PDF %s: %s", label, str(e))
+        return f"Error reading PDF: {str(e)}", {}
+    except Exception as e:
+        logging.error("Unexpected error processing PDF %s: %s", label, str(e))
+        return f"Unexpected error: {str(e)}", {}
+    finally:
+        if pdf_file is not None:
+            pdf_file.close()
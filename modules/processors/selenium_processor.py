@@ -2,31 +2,100 @@
 
 import os
 import sys
+import atexit
+import shutil
 import asyncio
-import requests
+import itertools
 import zipfile
 from io import BytesIO
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from config import MAX_RETRIES
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from config import MAX_RETRIES, FIREFOX_PROFILE_DIR, FIREFOX_PROFILE_MAX_SIZE, SELENIUM_POOL_SIZE
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from modules.utils.http_session import http_session
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
 
 GECKODRIVER_BASE_URL = "https://github.com/mozilla/geckodriver/releases/download/v0.35.0/"
 GECKODRIVER_REPO_URL = "https://github.com/mozilla/geckodriver/releases"
 
+# Errors that leave the browser session usable, so retries can reuse the running driver
+RECOVERABLE_SELENIUM_ERRORS = (TimeoutException, StaleElementReferenceException, NoSuchElementException)
+
+# Finds and clicks a "Load More" control in a single round trip; returns whether one was clicked.
+# Links that go somewhere are excluded, since clicking one would navigate away from the page.
+CLICK_LOAD_MORE_SCRIPT = """
+const controls = document.querySelectorAll('button, [role=button], a:not([href]), a[href="#"]');
+const button = [...controls].find(e => /load more/i.test(e.textContent));
+if (button) { button.click(); return true; }
+return false;
+"""
+
+# Unique, non-empty absolute hrefs of all anchors, deduplicated in the browser
+COLLECT_LINKS_SCRIPT = """
+return [...new Set(Array.from(document.querySelectorAll('a[href]'), a => a.href))].filter(Boolean);
+"""
+
+# Milliseconds since the last resource finished loading (or since navigation if none loaded)
+NETWORK_QUIET_SCRIPT = """
+const entries = performance.getEntriesByType('resource');
+const lastEnd = entries.reduce((latest, e) => Math.max(latest, e.responseEnd), 0);
+return performance.now() - lastEnd;
+"""
+
+def _try_lock(lock_file) -> bool:
+    """
+    Try to take an exclusive OS lock on an open file without blocking.
+
+    The lock is released when the file is closed, including when the process dies.
+
+    Args:
+        lock_file: The file to lock, opened in binary mode.
+
+    Returns:
+        bool: True if the lock was taken, False if another open file holds it.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
 class SeleniumDriver:
     """A class to manage Selenium WebDriver for Firefox."""
 
     def __init__(self):
         """Initialize SeleniumDriver with driver set to None."""
         self.driver = None
+        # A single browser can only load one page at a time
+        self.fetch_lock = asyncio.Lock()
         self.driver_path = self._get_driver_path()
+        # Claimed when the browser is first launched; see `_claim_profile_dir`
+        self.profile_dir: Optional[str] = None
+        self._profile_lock = None
 
     def _get_driver_path(self) -> str:
         """
@@ -38,6 +107,53 @@ class SeleniumDriver:
         base_path = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(base_path, 'drivers', 'geckodriver')
 
+    def _claim_profile_dir(self) -> str:
+        """
+        Claim the first profile slot under FIREFOX_PROFILE_DIR not used by another browser.
+
+        Firefox allows one process per profile, so each slot is guarded by a lock file
+        held for the life of this driver. Browsers in this process and in concurrent
+        runs therefore never share a profile, while a later run reuses the slots (and
+        their warm caches) of an earlier one.
+
+        Returns:
+            str: Path to the claimed profile directory.
+        """
+        base_dir = os.path.expanduser(FIREFOX_PROFILE_DIR)
+        os.makedirs(base_dir, exist_ok=True)
+        for slot in itertools.count():
+            lock_file = open(os.path.join(base_dir, f"{slot}.lock"), 'a+b')
+            if _try_lock(lock_file):
+                self._profile_lock = lock_file
+                return os.path.join(base_dir, str(slot))
+            lock_file.close()
+
+    def _prepare_profile(self) -> str:
+        """
+        Create the persistent Firefox profile directory, pruning it if it has grown too large.
+
+        Reusing the profile across sessions keeps the HTTP cache, DNS cache and TLS
+        session tickets warm between runs.
+
+        Returns:
+            str: Path to the profile directory.
+        """
+        if self.profile_dir is None:
+            self.profile_dir = self._claim_profile_dir()
+        if os.path.isdir(self.profile_dir):
+            size = 0
+            for root, _, files in os.walk(self.profile_dir):
+                for name in files:
+                    try:
+                        size += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        pass
+            if size > FIREFOX_PROFILE_MAX_SIZE:
+                logging.info(f"Firefox profile at {self.profile_dir} exceeds size cap, resetting it")
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return self.profile_dir
+
     def _download_driver(self) -> bool:
         """
         Download the geckodriver if it doesn't exist.
@@ -59,7 +175,7 @@ class SeleniumDriver:
             return False
 
         try:
-            response = requests.get(driver_url)
+            response = http_session.get(driver_url, timeout=(5, 30))
             response.raise_for_status()
 
             driver_dir = os.path.dirname(self.driver_path)
@@ -105,6 +221,10 @@ class SeleniumDriver:
             firefox_options = FirefoxOptions()
             firefox_options.add_argument("--no-sandbox")
             firefox_options.add_argument("--disable-dev-shm-usage")
+            firefox_options.add_argument("-profile")
+            firefox_options.add_argument(self._prepare_profile())
+            firefox_options.set_preference("browser.cache.disk.enable", True)
+            firefox_options.set_preference("network.http.fast-fallback-to-IPv4", True)
 
             service = FirefoxService(executable_path=self.driver_path)
             self.driver = webdriver.Firefox(service=service, options=firefox_options)
@@ -117,10 +237,42 @@ class SeleniumDriver:
             self.driver.quit()
             self.driver = None
 
+    async def _wait_network_idle(self, driver: webdriver.Firefox, idle_ms: int = 500, timeout_s: float = 5) -> None:
+        """
+        Wait until the page has stopped loading network resources.
+
+        geckodriver does not expose CDP network events, so idleness is derived from
+        the Resource Timing buffer: the page is considered idle once no resource has
+        finished loading for `idle_ms` milliseconds. Returns immediately for pages
+        that are already quiet.
+
+        Args:
+            driver (webdriver.Firefox): The active WebDriver.
+            idle_ms (int): Required quiet period in milliseconds.
+            timeout_s (float): Maximum time to wait in seconds.
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout_s
+        while True:
+            try:
+                quiet_ms = await loop.run_in_executor(None, driver.execute_script, NETWORK_QUIET_SCRIPT)
+            except Exception as e:
+                logging.debug(f"Network idle detection unavailable, falling back to fixed wait: {str(e)}")
+                await asyncio.sleep(idle_ms / 1000)
+                return
+
+            remaining = deadline - loop.time()
+            if quiet_ms is None or quiet_ms >= idle_ms or remaining <= 0:
+                return
+            await asyncio.sleep(min((idle_ms - quiet_ms) / 1000, remaining))
+
     async def fetch_with_selenium(self, url: str, timeout: int = 30, scroll_pause: int = 1, max_scrolls: int = 10) -> tuple:
         """
         Fetch page content using Selenium for dynamic content.
 
+        Failed attempts are retried up to MAX_RETRIES times. A browser whose session
+        died is quit, so the next attempt or fetch launches a fresh one.
+
         Args:
             url (str): The URL to fetch.
             timeout (int): Maximum time to wait for page load.
@@ -128,10 +280,17 @@ class SeleniumDriver:
             max_scrolls (int): Maximum number of scroll attempts.
 
         Returns:
-            tuple: (page_source, content_type, discovered_urls)
+            tuple: (page_source, content_type, discovered_urls), or (None, None, []) if
+            every attempt failed.
         """
-        driver = self.setup_selenium()
+        async with self.fetch_lock:
+            return await self._fetch(url, timeout, scroll_pause, max_scrolls)
+
+    async def _fetch(self, url: str, timeout: int, scroll_pause: int, max_scrolls: int) -> tuple:
+        """Fetch a page with the browser. Callers must hold `fetch_lock`."""
         for attempt in range(MAX_RETRIES):
+            # Launching Firefox (and possibly downloading geckodriver) blocks, so keep it off the event loop
+            driver = self.driver if self.driver is not None else await asyncio.to_thread(self.setup_selenium)
             try:
                 await asyncio.get_event_loop().run_in_executor(None, driver.get, url)
                 
@@ -161,16 +320,20 @@ class SeleniumDriver:
                     )
                     if new_height == last_height:
                         try:
-                            load_more_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Load More')]")
-                            await asyncio.get_event_loop().run_in_executor(None, load_more_button.click)
-                            await asyncio.sleep(scroll_pause)
-                            continue
+                            clicked = await asyncio.get_event_loop().run_in_executor(
+                                None, driver.execute_script, CLICK_LOAD_MORE_SCRIPT
+                            )
                         except Exception as e:
-                            logging.debug(f"No 'Load More' button found or error clicking it: {str(e)}")
+                            logging.debug(f"Error clicking 'Load More' button: {str(e)}")
+                            clicked = False
+                        if not clicked:
+                            logging.debug("No 'Load More' button found, page fully scrolled")
                             break
+                        await asyncio.sleep(scroll_pause)
+                        continue
                     last_height = new_height
 
-                await asyncio.sleep(5)
+                await self._wait_network_idle(driver, idle_ms=500, timeout_s=5)
 
                 is_jquery_active = await asyncio.get_event_loop().run_in_executor(
                     None, driver.execute_script, "return window.jQuery && jQuery.active > 0"
@@ -183,29 +346,111 @@ class SeleniumDriver:
                         )
                     )
 
-                page_source = await asyncio.get_event_loop().run_in_executor(None, lambda: driver.page_source)
+                page_source = await asyncio.get_event_loop().run_in_executor(
+                    None, driver.execute_script, "return document.documentElement.outerHTML"
+                )
                 content_type = await asyncio.get_event_loop().run_in_executor(
                     None, driver.execute_script, "return document.contentType || 'text/html';"
                 )
                 
-                if isinstance(page_source, bytes):
-                    page_source = page_source.decode('utf-8', errors='ignore')
-                elif page_source is None:
+                if page_source is None:
                     logging.error(f"Failed to retrieve page source for {url}")
                     return None, None, []
 
                 discovered_urls = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: list(set(filter(None, [element.get_attribute('href') for element in driver.find_elements(By.TAG_NAME, 'a')])))
+                    None, driver.execute_script, COLLECT_LINKS_SCRIPT
                 )
 
                 return page_source, content_type, discovered_urls
             except Exception as e:
-                if attempt < MAX_RETRIES - 1:
-                    logging.warning(f"Attempt {attempt + 1} failed. Retrying...")
-                    self.quit_selenium()  # Close the current driver
-                    self.driver = None    # Reset the driver
-                    await asyncio.sleep(3)  # Wait before retrying
-                else:
+                if not isinstance(e, RECOVERABLE_SELENIUM_ERRORS):
+                    # Dead session (WebDriverException, InvalidSessionIdException, ...): quit it so
+                    # the next fetch relaunches the browser, even after the last attempt
+                    await asyncio.to_thread(self.quit_selenium)
+
+                if attempt >= MAX_RETRIES - 1:
                     logging.error(f"All attempts failed for {url}: {str(e)}")
-                    return None, None, []
\ No newline at end of file
+                    return None, None, []
+
+                logging.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}. Retrying...")
+                if isinstance(e, RECOVERABLE_SELENIUM_ERRORS):
+                    # The browser is still healthy, so keep it warm and just reset the tab
+                    try:
+                        await asyncio.get_event_loop().run_in_executor(None, driver.get, 'about:blank')
+                    except WebDriverException:
+                        await asyncio.to_thread(self.quit_selenium)
+                await asyncio.sleep(min(2 ** attempt, 8))
+
+class SeleniumPool:
+    """
+    A bounded pool of SeleniumDrivers shared by all scrapers.
+
+    Drivers are created on demand up to the pool size and leased to one fetch at a
+    time, so the number of running browsers stays capped however many scrapers
+    there are. A driver whose browser session dies quits it itself (see
+    `SeleniumDriver.fetch_with_selenium`), so the next fetch on it relaunches the browser.
+
+    Attributes:
+        size (int): Maximum number of drivers.
+        drivers (List[SeleniumDriver]): All drivers created so far.
+    """
+
+    def __init__(self, size: int = SELENIUM_POOL_SIZE):
+        self.size = size
+        self.drivers: List[SeleniumDriver] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[SeleniumDriver]:
+        """
+        Borrow a driver for the duration of the block, waiting if all are in use.
+
+        Usage:
+            async with pool.lease() as driver:
+                ...  # use the driver
+        """
+        if self._idle.empty() and len(self.drivers) < self.size:
+            driver = SeleniumDriver()
+            self.drivers.append(driver)
+        else:
+            driver = await self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put_nowait(driver)
+
+    async def fetch_with_selenium(self, url: str, **kwargs) -> tuple:
+        """
+        Fetch a page with the next free driver; see `SeleniumDriver.fetch_with_selenium`.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            tuple: (page_source, content_type, discovered_urls)
+        """
+        async with self.lease() as driver:
+            return await driver.fetch_with_selenium(url, **kwargs)
+
+    def quit_selenium(self) -> None:
+        """Quit every browser in the pool."""
+        for driver in self.drivers:
+            driver.quit_selenium()
+
+_shared_pool: Optional[SeleniumPool] = None
+
+def get_selenium_pool() -> SeleniumPool:
+    """
+    Get the process-wide SeleniumPool, creating it on first use.
+
+    Browsers are launched lazily by the pool, so this is cheap to call even when
+    no page ends up needing Selenium; they are quit when the interpreter exits.
+
+    Returns:
+        SeleniumPool: The shared pool.
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = SeleniumPool()
+        atexit.register(_shared_pool.quit_selenium)
+    return _shared_pool
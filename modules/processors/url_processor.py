@@ -7,22 +7,62 @@ normalization, and extraction from web content.
 
 Functions:
     get_domain(url: str) -> str
-    is_valid_url(url: str, base_url: str) -> bool
+    is_valid_url(url: str, base_url: Union[str, SplitResult]) -> bool
+    is_valid_url_fast(url: str, base_netloc: str) -> bool
+    normalize_netloc(scheme: str, netloc: str) -> str
     normalize_url(url: str) -> str
+    is_under_base(normalized: str, base_url: str) -> bool
+    normalize_and_filter_urls(urls: Iterable[str], base_url: str) -> Set[str]
+    classify_url(url: str, base_url: str) -> Tuple[str, bool, bool]
+    url_fingerprint(url: str) -> str
     is_suspicious_url(url: str) -> bool
-    is_image_content_type(url: str) -> bool
-    is_pdf_url(url: str) -> bool
+    async is_image_content_type(url: str) -> bool
+    async is_pdf_url(url: str) -> bool
     extract_urls(content: str, base_url: str, content_type: str = 'text/html') -> set
 """
 
-import requests
-from urllib.parse import urljoin, urlparse, parse_qs
-from bs4 import BeautifulSoup
-from ..utils.utils import is_image_file_extension
+import re
+import asyncio
+import aiohttp
+from functools import lru_cache
+from typing import Iterable, Set, Tuple, Union
+from urllib.parse import SplitResult, urljoin, urlsplit
+from lxml import etree, html as lxml_html
+from ..utils.utils import cached_urlsplit, is_image_file_extension, is_image_content_type
+from ..utils.http_session import get_http_session
+from config import REQUEST_TIMEOUT
 
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
 
+# Ports dropped from the host during normalization, since they are implied by the scheme
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Query parameters that mark gallery/media item URLs
+SUSPICIOUS_QUERY_PARAMS = frozenset(('itemId', 'imageId', 'galleryId'))
+
+# Entries kept by the memoized per-URL helpers; sized for a large frontier
+URL_CACHE_SIZE = 100_000
+
+# HEAD-probed PDF checks, oldest entries evicted first
+PDF_URL_CACHE_SIZE = 10_000
+_pdf_url_cache = {}
+
+# Content reaching extract_urls has already been decoded/re-encoded as UTF-8
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Compiled once; plain strings avoid keeping each parsed tree alive through the results
+_ANCHOR_HREFS = etree.XPath('//a/@href', smart_strings=False)
+
+# Path segments that are identifiers rather than structure, with the placeholder each becomes
+ID_SEGMENT_PATTERNS = (
+    (re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE), '{uuid}'),
+    (re.compile(r'[0-7][0-9a-hjkmnp-tv-z]{25}', re.IGNORECASE), '{ulid}'),
+    (re.compile(r'[0-9a-f]{24}|[0-9a-f]{32}|[0-9a-f]{40}|[0-9a-f]{64}', re.IGNORECASE), '{hash}'),
+    (re.compile(r'\d+'), '{id}'),
+)
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def get_domain(url: str) -> str:
     """
     Extract the domain from a given URL.
@@ -33,27 +73,78 @@ def get_domain(url: str) -> str:
     Returns:
         str: The extracted domain.
     """
-    parsed_url = urlparse(url)
+    parsed_url = cached_urlsplit(url)
     return parsed_url.netloc
 
-def is_valid_url(url: str, base_url: str) -> bool:
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def is_valid_url(url: str, base_url: Union[str, SplitResult]) -> bool:
     """
     Check if a URL is valid and belongs to the same domain as the base URL.
 
     Args:
         url (str): The URL to check.
-        base_url (str): The base URL to compare against.
+        base_url (Union[str, SplitResult]): The base URL to compare against, either as a
+            string or already split with `urlsplit` so callers checking many URLs parse it once.
 
     Returns:
         bool: True if the URL is valid and belongs to the same domain, False otherwise.
     """
-    parsed_url = urlparse(url)
-    parsed_base = urlparse(base_url)
+    parsed_url = cached_urlsplit(url)
+    parsed_base = cached_urlsplit(base_url) if isinstance(base_url, str) else base_url
     return (parsed_url.netloc == parsed_base.netloc and not is_image_file_extension(parsed_url.path))
 
+def is_valid_url_fast(url: str, base_netloc: str) -> bool:
+    """
+    Check an absolute URL against a precomputed base netloc without running urlsplit.
+
+    Same result as `is_valid_url` for absolute URLs, but only scans for the few
+    delimiters it needs. Meant for large batches such as sitemap entries.
+
+    Args:
+        url (str): The absolute URL to check.
+        base_netloc (str): The netloc of the base URL, e.g. `urlsplit(base_url).netloc`.
+
+    Returns:
+        bool: True if the URL is on the base netloc and is not a media file, False otherwise.
+    """
+    start = url.find('://')
+    if start < 0:
+        return False
+    start += 3
+    end = len(url)
+    for delimiter in '/?#':
+        index = url.find(delimiter, start, end)
+        if index >= 0:
+            end = index
+    if url[start:end] != base_netloc:
+        return False
+    path = url[end:].partition('?')[0].partition('#')[0]
+    return not is_image_file_extension(path)
+
+def normalize_netloc(scheme: str, netloc: str) -> str:
+    """
+    Lowercase a host and drop the port if it is the scheme's default.
+
+    Args:
+        scheme (str): The lowercased URL scheme.
+        netloc (str): The netloc as parsed from the URL.
+
+    Returns:
+        str: The normalized netloc.
+    """
+    netloc = netloc.lower()
+    default_port = DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    return netloc
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def normalize_url(url: str) -> str:
     """
-    Normalize a URL by removing trailing slashes and standardizing the scheme.
+    Normalize a URL by removing trailing slashes and standardizing the scheme and host.
+
+    Only the scheme and host are lowercased; the path is case-sensitive and kept as is.
+    A port that is the scheme's default (80 for http, 443 for https) is dropped.
 
     Args:
         url (str): The URL to normalize.
@@ -61,10 +152,84 @@ def normalize_url(url: str) -> str:
     Returns:
         str: The normalized URL.
     """
-    parsed = urlparse(url.lower())
-    scheme = parsed.scheme or 'https'  # Default to https if no scheme is provided
-    path = parsed.path.rstrip('/')  # Remove trailing slash from path
-    return f"{scheme}://{parsed.netloc}{path}"
+    parsed = urlsplit(url)
+    scheme = (parsed.scheme or 'https').lower()  # Default to https if no scheme is provided
+    path = parsed.path.rstrip('/')  # Remove trailing slash; paths are case-sensitive, so keep their case
+    return f"{scheme}://{normalize_netloc(scheme, parsed.netloc)}{path}"
+
+def is_under_base(normalized: str, base_url: str) -> bool:
+    """
+    Check whether a normalized URL is the base URL or falls under its path.
+
+    A plain prefix test is not enough: 'https://example.com.evil.org' and
+    'https://example.com/docs-old' both start with a base of 'https://example.com'
+    or 'https://example.com/docs'. The prefix must end at a path boundary.
+
+    Args:
+        normalized (str): The normalized URL to check.
+        base_url (str): The normalized base URL.
+
+    Returns:
+        bool: True if the URL is under the base URL, False otherwise.
+    """
+    return normalized.startswith(base_url) and (
+        len(normalized) == len(base_url) or normalized[len(base_url)] == '/'
+    )
+
+def normalize_and_filter_urls(urls: Iterable[str], base_url: str) -> Set[str]:
+    """
+    Normalize a batch of URLs and keep only those under the base URL.
+
+    Equivalent to `{normalize_url(u) for u in urls}` filtered on the normalized base
+    prefix, but done in a single pass that parses each URL once and rejects other
+    hosts on the netloc before building the normalized string.
+
+    Args:
+        urls (Iterable[str]): The URLs to normalize, e.g. links discovered on a page.
+        base_url (str): The normalized base URL that kept URLs must start with.
+
+    Returns:
+        Set[str]: The normalized URLs that fall under the base URL.
+    """
+    base_netloc = cached_urlsplit(base_url).netloc
+    normalized_urls = set()
+    for url in urls:
+        parsed = urlsplit(url)
+        scheme = (parsed.scheme or 'https').lower()
+        netloc = normalize_netloc(scheme, parsed.netloc)
+        if netloc != base_netloc:
+            continue
+        normalized = f"{scheme}://{netloc}{parsed.path.rstrip('/')}"
+        if is_under_base(normalized, base_url):
+            normalized_urls.add(normalized)
+    return normalized_urls
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def classify_url(url: str, base_url: str) -> Tuple[str, bool, bool]:
+    """
+    Normalize a URL and check it against the base URL and the suspicious-URL rules in one parse.
+
+    Equivalent to calling `normalize_url`, testing the result with `is_under_base`
+    and calling `is_suspicious_url`, but splits the URL only once. The suspicious check
+    looks at the original query string, which normalization drops.
+
+    Args:
+        url (str): The URL to classify, e.g. one taken from the pool.
+        base_url (str): The normalized base URL that internal URLs must start with.
+
+    Returns:
+        Tuple[str, bool, bool]: The normalized URL, whether it falls under the base URL,
+        and whether it looks like a media item worth checking before fetching.
+    """
+    parsed = urlsplit(url)
+    path = parsed.path.rstrip('/')
+    scheme = (parsed.scheme or 'https').lower()
+    normalized = f"{scheme}://{normalize_netloc(scheme, parsed.netloc)}{path}"
+    query = parsed.query
+    suspicious = bool(
+        query and not SUSPICIOUS_QUERY_PARAMS.isdisjoint(param.split('=', 1)[0] for param in query.split('&'))
+    ) or is_image_file_extension(path)
+    return normalized, is_under_base(normalized, base_url), suspicious
 
 def url_matches_base(url: str, base_url: str) -> bool:
     """
@@ -77,63 +242,84 @@ def url_matches_base(url: str, base_url: str) -> bool:
     Returns:
         bool: True if the URL matches the base URL, False otherwise.
     """
-    parsed_url = urlparse(url)
-    parsed_base = urlparse(base_url)
+    parsed_url = cached_urlsplit(url)
+    parsed_base = cached_urlsplit(base_url)
     return parsed_url.netloc == parsed_base.netloc and parsed_url.path.startswith(parsed_base.path)
 
 
-def is_suspicious_url(url: str) -> bool:
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def url_fingerprint(url: str) -> str:
     """
-    Check if a URL is suspicious based on query parameters or file extension.
+    Reduce a URL to its template by replacing identifier path segments with placeholders.
+
+    For example, '/user/42/profile' and '/user/97/profile' both become
+    '/user/{id}/profile', so only one of them needs to be crawled.
 
     Args:
-        url (str): The URL to check.
+        url (str): The normalized URL to fingerprint.
 
     Returns:
-        bool: True if the URL is suspicious, False otherwise.
+        str: The URL with UUID, ULID, hash and numeric path segments replaced.
     """
-    parsed_url = urlparse(url)
-    query_params = parse_qs(parsed_url.query)
-    suspicious_params = ['itemId', 'imageId', 'galleryId']
-    return any(param in query_params for param in suspicious_params) or is_image_file_extension(parsed_url.path)
+    parsed = cached_urlsplit(url)
+    segments = parsed.path.split('/')
+    for i, segment in enumerate(segments):
+        for pattern, placeholder in ID_SEGMENT_PATTERNS:
+            if pattern.fullmatch(segment):
+                segments[i] = placeholder
+                break
+    return f"{parsed.scheme}://{parsed.netloc}{'/'.join(segments)}"
 
-def is_image_content_type(url: str) -> bool:
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def is_suspicious_url(url: str) -> bool:
     """
-    Check if a URL points to an image based on its content type.
+    Check if a URL is suspicious based on query parameters or file extension.
 
     Args:
         url (str): The URL to check.
 
     Returns:
-        bool: True if the URL points to an image, False otherwise.
+        bool: True if the URL is suspicious, False otherwise.
     """
-    try:
-        response = requests.head(url)
-        content_type = response.headers.get('Content-Type', '')
-        return content_type.startswith('image/')
-    except requests.RequestException:
-        logging.error(f"Error checking content type for {url}")
-        return False
+    parsed_url = cached_urlsplit(url)
+    query = parsed_url.query
+    # Only parameter names matter, so skip parse_qs's value decoding
+    if query and not SUSPICIOUS_QUERY_PARAMS.isdisjoint(param.split('=', 1)[0] for param in query.split('&')):
+        return True
+    return is_image_file_extension(parsed_url.path)
 
-def is_pdf_url(url: str) -> bool:
+async def is_pdf_url(url: str) -> bool:
     """
     Check if a URL points to a PDF file.
 
+    URLs ending in '.pdf' are accepted without a network call; otherwise a HEAD
+    request is issued on the shared aiohttp session and its answer cached.
+
     Args:
         url (str): The URL to check.
 
     Returns:
         bool: True if the URL likely points to a PDF, False otherwise.
     """
+    if url.lower().endswith('.pdf'):
+        return True
+    if url in _pdf_url_cache:
+        return _pdf_url_cache[url]
+
     try:
-        if url.lower().endswith('.pdf'):
-            return True
-        response = requests.head(url, allow_redirects=True)
-        return 'application/pdf' in response.headers.get('Content-Type', '').lower()
-    except requests.RequestException:
+        session = await get_http_session()
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with session.head(url, allow_redirects=True, timeout=timeout) as response:
+            result = 'application/pdf' in response.headers.get('Content-Type', '').lower()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
         logging.warning(f"Error checking content type for {url}")
         return False
 
+    if len(_pdf_url_cache) >= PDF_URL_CACHE_SIZE:
+        _pdf_url_cache.pop(next(iter(_pdf_url_cache)))
+    _pdf_url_cache[url] = result
+    return result
+
 def extract_urls(content: str, base_url: str, content_type: str = 'text/html') -> set:
     """
     Extract URLs from the given content.
@@ -148,8 +334,10 @@ def extract_urls(content: str, base_url: str, content_type: str = 'text/html') -
     """
     try:
         if content_type.lower().startswith('text/html'):
-            soup = BeautifulSoup(content, 'html.parser')
-            return {urljoin(base_url, a['href']) for a in soup.find_all('a', href=True)}
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            tree = lxml_html.fromstring(content, parser=_HTML_PARSER)
+            return {urljoin(base_url, href) for href in _ANCHOR_HREFS(tree) if href}
         elif content_type.lower() == 'application/pdf':
             logging.info(f"Skipping URL extraction for PDF content: {base_url}")
             return set()
@@ -3,12 +3,13 @@
 import asyncio
 from typing import Dict, Any, Optional
 from selenium.common.exceptions import WebDriverException
-from .processors.url_processor import normalize_url, is_suspicious_url, get_domain
+from .processors.url_processor import normalize_url, normalize_and_filter_urls, classify_url, url_fingerprint
 from .processors.content_processor import process_page
-from .processors.selenium_processor import SeleniumDriver
-from .utils.utils import is_image_content_type, AsyncRateLimiter
+from .processors.selenium_processor import SeleniumPool, get_selenium_pool
+from .utils.utils import is_image_content_type, compress_text, AsyncRateLimiter
 from .utils.url_tracker import url_tracker
-from config import MAX_SIMULTANEOUS_SCRAPERS, MAX_URLS_TO_SCRAPE
+from .utils.checkpoint import CrawlCheckpoint
+from config import MAX_SIMULTANEOUS_SCRAPERS, MAX_URLS_TO_SCRAPE, POOL_POLL_INTERVAL, URL_FINGERPRINT_DEDUP
 
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
@@ -25,27 +26,39 @@ class WebsiteScraper:
         scraper_id (int): Unique identifier for this scraper instance.
         discovery_mode (bool): Whether to scrape the entire site or just the base URL.
         force_scrape_method (Optional[str]): Method to force for scraping ('req' or 'sel').
-        selenium_driver (Optional[SeleniumDriver]): Instance of SeleniumDriver for Selenium operations.
-        rate_limiter (AsyncRateLimiter): Instance of the rate limiter.
+        selenium_driver (Optional[SeleniumPool]): Shared pool of Selenium drivers used for Selenium operations.
+        rate_limiter (AsyncRateLimiter): Rate limiter, shared with the other scrapers of the crawl.
+        checkpoint (Optional[CrawlCheckpoint]): Checkpoint each scraped page is appended to.
     """
 
-    def __init__(self, base_url: str, scraper_id: int, discovery_mode: bool, force_scrape_method: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str,
+        scraper_id: int,
+        discovery_mode: bool,
+        force_scrape_method: Optional[str] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+    ):
         self.base_url = base_url
+        # URLs are compared against the base in normalized form; compute it once
+        self._normalized_base = normalize_url(base_url)
         self.scraper_id = scraper_id
         self.discovery_mode = discovery_mode
         self.force_scrape_method = force_scrape_method
-        self.selenium_driver: Optional[SeleniumDriver] = None
-        self.rate_limiter = AsyncRateLimiter()
+        self.selenium_driver: Optional[SeleniumPool] = None
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        self.checkpoint = checkpoint
 
-    def get_selenium_driver(self) -> SeleniumDriver:
+    async def get_selenium_driver(self) -> SeleniumPool:
         """
-        Get or create a Selenium driver instance.
+        Get the shared pool of Selenium drivers.
 
         Returns:
-            SeleniumDriver: An instance of the Selenium driver.
+            SeleniumPool: The process-wide Selenium pool.
         """
         if self.selenium_driver is None:
-            self.selenium_driver = SeleniumDriver()
+            self.selenium_driver = get_selenium_pool()
         return self.selenium_driver
 
     async def scrape(self) -> Dict[str, Any]:
@@ -58,92 +71,111 @@ class WebsiteScraper:
         Returns:
             Dict[str, Any]: A dictionary containing the scraping results.
         """
-        logging.debug(f"Initializing scraper (ID: {self.scraper_id})")
+        logging.debug("Initializing scraper (ID: %d)", self.scraper_id)
         results: Dict[str, Any] = {}
 
         try:
             while True:
-                url = await url_tracker.get_next_url()
-                if url is None or (self.discovery_mode and len(results) >= MAX_URLS_TO_SCRAPE):
-                    logging.debug(f"Scraper {self.scraper_id}: No more URLs to process or reached MAX_URLS_TO_SCRAPE.")
+                if self.discovery_mode and len(results) >= MAX_URLS_TO_SCRAPE:
+                    logging.debug("Scraper %d: Reached MAX_URLS_TO_SCRAPE.", self.scraper_id)
                     break
 
-                normalized_url = normalize_url(url)
+                url = url_tracker.get_next_url()
+                if url is None:
+                    if self.discovery_mode and url_tracker.get_in_progress_count() > 0:
+                        # Other scrapers may still add URLs from the pages they are processing
+                        await asyncio.sleep(POOL_POLL_INTERVAL)
+                        continue
+                    logging.debug("Scraper %d: No more URLs to process.", self.scraper_id)
+                    break
+
+                try:
+                    normalized_url, is_internal, is_suspicious = classify_url(url, self._normalized_base)
                 
-                if not normalized_url.startswith(self.base_url):
-                    logging.debug(f"Scraper {self.scraper_id}: Skipping URL not starting with base URL: {normalized_url}")
-                    continue
+                    if not is_internal:
+                        logging.debug("Scraper %d: Skipping URL not starting with base URL: %s", self.scraper_id, normalized_url)
+                        continue
 
-                if await url_tracker.is_visited(normalized_url):
-                    logging.debug(f"Scraper {self.scraper_id}: Skipping already visited URL: {normalized_url}")
-                    continue
+                    if url_tracker.is_visited(normalized_url):
+                        logging.debug("Scraper %d: Skipping already visited URL: %s", self.scraper_id, normalized_url)
+                        continue
 
-                if is_suspicious_url(normalized_url):
-                    if is_image_content_type(normalized_url):
-                        logging.debug(f"Scraper {self.scraper_id}: Skipping image URL: {normalized_url}")
+                    # Probe the URL as classified: its query string, which normalization drops, may be what made it suspicious
+                    if is_suspicious and await is_image_content_type(url):
+                        logging.debug("Scraper %d: Skipping image URL: %s", self.scraper_id, url)
                         continue
 
-                try:
-                    logging.info(f"Scraper {self.scraper_id}: Attempting to process URL: {normalized_url}")
-                    domain = get_domain(normalized_url)
-                    await self.rate_limiter.wait(domain)
-                    content, content_type, extracted_text, metadata, discovered_urls = await process_page(
-                        self.scraper_id,
-                        normalized_url, 
-                        self.force_scrape_method, 
-                        selenium_driver=self.get_selenium_driver(),
-                    )
+                    try:
+                        logging.info("Scraper %d: Attempting to process URL: %s", self.scraper_id, normalized_url)
+                        # The rate limiter is held only around the requests, not the extraction
+                        content_type, extracted_text, metadata, discovered_urls = await process_page(
+                            self.scraper_id,
+                            normalized_url, 
+                            self.force_scrape_method, 
+                            selenium_driver=await self.get_selenium_driver(),
+                            rate_limiter=self.rate_limiter,
+                        )
                     
-                    if self.discovery_mode:
-                        # Normalize all discovered URLs
-                        all_discovered_urls = set(normalize_url(url) for url in discovered_urls)
+                        if self.discovery_mode:
+                            # Normalize discovered URLs, keeping only those under the base URL
+                            urls_for_processing = normalize_and_filter_urls(discovered_urls, self._normalized_base)
+                            if URL_FINGERPRINT_DEDUP:
+                                # Keep one URL per path template across the whole crawl
+                                urls_for_processing = {
+                                    url for url in urls_for_processing
+                                    if url_tracker.claim_fingerprint(url_fingerprint(url))
+                                }
                         
-                        # Filter URLs for processing (only those starting with base_url)
-                        urls_for_processing = {url for url in all_discovered_urls if url.startswith(self.base_url)}
-                        
-                        # Add new URLs to the shared pool
-                        await url_tracker.add_bulk_to_pool(urls_for_processing)
+                            # Add new URLs to the shared pool
+                            url_tracker.add_bulk_to_pool(urls_for_processing)
                     
-                    results[normalized_url] = {
-                        'metadata': metadata,
-                        'content': extracted_text,
-                        'discovered_urls': sorted(list(discovered_urls)) if self.discovery_mode else [],
-                    }
+                        results[normalized_url] = {
+                            'metadata': metadata,
+                            'content': compress_text(extracted_text),  # Decompressed at output time
+                            'discovered_urls': discovered_urls if self.discovery_mode else [],  # Sorted at output time
+                        }
                     
-                    await url_tracker.mark_visited(normalized_url)
-                    logging.info(f"Scraper {self.scraper_id}: Successfully processed {normalized_url}")
-
-                    if not self.discovery_mode:
-                        break  # Stop after processing the first URL in non-discovery mode
-
-                except WebDriverException as e:
-                    error_message = f"Scraper {self.scraper_id}: Selenium error processing {normalized_url}: {str(e)}"
-                    logging.error(error_message)
-                    if self.selenium_driver:
-                        self.selenium_driver.quit_selenium()
-                    self.selenium_driver = None
-                    await url_tracker.return_url_to_pool(normalized_url)
-
-                except Exception as e:
-                    error_message = f"Scraper {self.scraper_id}: Error processing {normalized_url}: {str(e)}"
-                    logging.error(error_message)
-                    results[normalized_url] = {'content': error_message}
-                    await url_tracker.mark_visited(normalized_url)
+                        url_tracker.mark_visited(normalized_url)
+                        # A failed fetch is left out so a resumed crawl tries the page again
+                        if self.checkpoint is not None and extracted_text is not None:
+                            self.checkpoint.record(normalized_url, {**results[normalized_url], 'content': extracted_text})
+                        logging.info("Scraper %d: Successfully processed %s", self.scraper_id, normalized_url)
+
+                        if not self.discovery_mode:
+                            break  # Stop after processing the first URL in non-discovery mode
+
+                    except WebDriverException as e:
+                        error_message = f"Scraper {self.scraper_id}: Selenium error processing {normalized_url}: {str(e)}"
+                        logging.error(error_message)
+                        # The failed browser has already been quit by its driver; the next fetch relaunches it
+                        url_tracker.return_url_to_pool(normalized_url)
+
+                    except Exception as e:
+                        error_message = f"Scraper {self.scraper_id}: Error processing {normalized_url}: {str(e)}"
+                        logging.error(error_message)
+                        results[normalized_url] = {'content': error_message}
+                        url_tracker.mark_visited(normalized_url)
+                finally:
+                    url_tracker.finish_url(url)
 
         finally:
-            if self.selenium_driver:
-                self.selenium_driver.quit_selenium()
-            logging.info(f"Scraper {self.scraper_id}: Scraper terminated.")
+            logging.info("Scraper %d: Scraper terminated.", self.scraper_id)
 
         return results
 
-async def run_scrapers(base_url: str, discovery_mode: bool, force_scrape_method: Optional[str] = None) -> Dict[str, Any]:
+async def run_scrapers(
+    base_url: str,
+    discovery_mode: bool,
+    force_scrape_method: Optional[str] = None,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+) -> Dict[str, Any]:
     """
     Run scrapers concurrently using a shared URL pool.
 
     Args:
         discovery_mode (bool): Whether to scrape the entire site or just the base URL.
         force_scrape_method (Optional[str]): Method to force for scraping ('req' or 'sel').
+        checkpoint (Optional[CrawlCheckpoint]): Checkpoint scraped pages are appended to.
 
     Returns:
         Dict[str, Any]: Collated results from all scrapers.
@@ -155,15 +187,19 @@ async def run_scrapers(base_url: str, discovery_mode: bool, force_scrape_method:
 
     if not discovery_mode:
         # Run a single scraper for the base URL
-        scraper = WebsiteScraper(base_url, 1, discovery_mode, force_scrape_method)
+        scraper = WebsiteScraper(base_url, 1, discovery_mode, force_scrape_method, checkpoint=checkpoint)
         results = await scraper.scrape()
     else:
-        # Create scrapers based on the number of URLs in the pool
-        pool_size = await url_tracker.get_pool_size()
-        num_scrapers = min(MAX_SIMULTANEOUS_SCRAPERS, max(1, pool_size))
-        logging.info(f"Starting {MAX_SIMULTANEOUS_SCRAPERS} scrapers...")
-
-        scrapers = [WebsiteScraper(base_url, i+1, discovery_mode, force_scrape_method) for i in range(num_scrapers)]
+        # Start every scraper even if the pool holds only the base URL: idle scrapers
+        # wait for URLs discovered by the others instead of exiting
+        logging.info("Starting %d scrapers...", MAX_SIMULTANEOUS_SCRAPERS)
+
+        # One rate limiter for all scrapers, so per-domain limits apply to the crawl as a whole
+        rate_limiter = AsyncRateLimiter()
+        scrapers = [
+            WebsiteScraper(base_url, i+1, discovery_mode, force_scrape_method, rate_limiter=rate_limiter, checkpoint=checkpoint)
+            for i in range(MAX_SIMULTANEOUS_SCRAPERS)
+        ]
         results = await asyncio.gather(*(scraper.scrape() for scraper in scrapers))
 
     # Collate results
@@ -0,0 +1,90 @@
+"""
+Module for checkpointing scraped pages so an interrupted crawl can be resumed.
+
+Each successfully scraped page is appended to a JSON Lines file as soon as it is
+processed. On resume the file is read back: its pages are marked visited so they
+are not fetched again, and their discovered URLs rebuild the crawl frontier.
+"""
+
+import os
+import json
+from typing import IO, Any, Dict, Optional
+from modules.utils.file_handler import create_directory, delete_file, dumps_json
+
+from modules.utils.logger import get_logger
+logging = get_logger(__name__)
+
+class CrawlCheckpoint:
+    """
+    An append-only record of the pages scraped so far in a crawl.
+
+    Attributes:
+        path (str): Path of the JSON Lines checkpoint file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path (str): Path of the JSON Lines checkpoint file.
+        """
+        self.path = path
+        # Opened on the first record and kept open for the rest of the crawl
+        self._file: Optional[IO[str]] = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read back the pages recorded by a previous run.
+
+        A last line cut short by the interruption is skipped.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Results keyed by URL, in the same shape as the scrapers' results.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return results
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning("Skipping unreadable checkpoint line %d in %s", line_number, self.path)
+                    continue
+                results[record.pop('url')] = record
+        logging.info("Loaded %d pages from checkpoint %s", len(results), self.path)
+        return results
+
+    def record(self, url: str, result: Dict[str, Any]) -> None:
+        """
+        Append one scraped page to the checkpoint.
+
+        Args:
+            url (str): The normalized URL of the page.
+            result (Dict[str, Any]): The page's entry in the scraper results.
+        """
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(dumps_json({'url': url, **result}).decode('utf-8') + '\n')
+        # Hand each record to the OS right away so it survives the process being killed
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the checkpoint file if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reset(self) -> None:
+        """Start an empty checkpoint, discarding any left by a previous run."""
+        self.close()
+        create_directory(os.path.dirname(self.path) or '.')
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the crawl's output has been saved."""
+        self.close()
+        if os.path.exists(self.path):
+            delete_file(self.path)
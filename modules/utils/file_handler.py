@@ -1,14 +1,82 @@
 # file_handler.py
 
+import io
 import os
 import csv
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
 
+# Large write buffer so output files are written in a few big chunks
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+def _json_default(obj):
+    # Collections of URLs may still be sets; serialize them deterministically
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(data, indent=False):
+    """
+    Serialize data to UTF-8 encoded JSON with sorted keys.
+
+    Uses orjson when it is installed and falls back to the standard library otherwise.
+
+    Args:
+        data: The data to serialize
+        indent (bool): Whether to indent the output by two spaces
 
-def save_output(data, domain, filename, output_format):
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(
+        data, indent=2 if indent else None, separators=None if indent else (',', ':'),
+        ensure_ascii=False, sort_keys=True, default=_json_default
+    ).encode('utf-8')
+
+def _json_key(key):
+    # Object keys must be strings; convert any other key the way the encoder does
+    if isinstance(key, str):
+        return key
+    return next(iter(json.loads(dumps_json({key: None}))))
+
+def write_json_stream(data, f, indent=False, level=0):
+    """
+    Write data as JSON to a binary file, one dict entry at a time.
+
+    Produces the same document as `dumps_json(data, indent=indent)` without first
+    building the whole encoded output in memory.
+
+    Args:
+        data: The data to serialize
+        f: A binary file object to write to
+        indent (bool): Whether to indent the output by two spaces
+        level (int): Current nesting depth, used for indentation
+    """
+    if not isinstance(data, dict) or not data:
+        encoded = dumps_json(data, indent=indent)
+        f.write(encoded.replace(b'\n', b'\n' + b'  ' * level) if indent and level else encoded)
+        return
+    pad, closing, separator = (b'\n' + b'  ' * (level + 1), b'\n' + b'  ' * level, b': ') if indent else (b'', b'', b':')
+    keys = {_json_key(key): key for key in data}
+    f.write(b'{')
+    for i, name in enumerate(sorted(keys)):
+        f.write((b',' if i else b'') + pad + dumps_json(name) + separator)
+        write_json_stream(data[keys[name]], f, indent, level + 1)
+    f.write(closing + b'}')
+
+def save_output(data, domain, filename, output_format, pretty=False):
     """
     Save the formatted output to a file.
 
@@ -17,6 +85,8 @@ def save_output(data, domain, filename, output_format):
         domain (str): The domain being scraped
         filename (str): Name of the output file
         output_format (str): Format of the output ('csv' or 'json')
+        pretty (bool): Whether to indent JSON output for readability; compact
+                       output is about half the size. Ignored for CSV.
 
     Returns:
         str: The full path of the output file
@@ -33,19 +103,25 @@ def save_output(data, domain, filename, output_format):
         # Full path for the output file
         full_path = os.path.join(domain_dir, filename)
         
-        logging = get_logger(__name__)
-        
         if output_format == 'csv':
-            with open(full_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(data)
+            # Rows are formatted in memory and written out in OUTPUT_BUFFER_SIZE chunks
+            with open(full_path, 'wb') as f:
+                buffer = io.StringIO(newline='')
+                writer = csv.writer(buffer)
+                for row in data:
+                    writer.writerow(row)
+                    if buffer.tell() >= OUTPUT_BUFFER_SIZE:
+                        f.write(buffer.getvalue().encode('utf-8'))
+                        buffer.seek(0)
+                        buffer.truncate()
+                f.write(buffer.getvalue().encode('utf-8'))
         elif output_format == 'json':
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(full_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+                write_json_stream(data, f, indent=pretty)
         else:
             raise ValueError(f"Invalid output format: {output_format}")
         
-        logging.debug(f"Successfully saved output to {full_path}")
+        logging.debug("Successfully saved output to %s", full_path)
         return full_path
     except IOError as e:
         logging.error(f"Error writing to file {filename}: {e}")
@@ -156,7 +232,8 @@ def list_files(dir_path):
         OSError: If there's an error reading the directory
     """
     try:
-        return os.listdir(dir_path)
+        with os.scandir(dir_path) as entries:
+            return [entry.name for entry in entries]
     except OSError as e:
         logging.error(f"Error listing files in directory {dir_path}: {e}")
         raise
@@ -0,0 +1,70 @@
+"""
+Shared HTTP sessions for the requests made by the scraper.
+
+Reusing one requests.Session (for synchronous code) and one aiohttp.ClientSession
+(for code running on the event loop) keeps connections alive between calls, so
+repeat requests to a host skip the TCP and TLS handshakes.
+"""
+
+import aiohttp
+import requests
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from config import HEADERS
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with a connection pool sized for concurrent scrapers.
+
+    Connection errors and 429/5xx responses are retried by urllib3 with backoff,
+    honoring Retry-After. Only the geckodriver download uses this session; crawl
+    traffic goes through the aiohttp session from `get_http_session`.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # Only advertise encodings urllib3 can actually decode in this environment (br needs Brotli)
+    session.headers['Accept-Encoding'] = DEFAULT_ACCEPT_ENCODING
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=64, pool_maxsize=128, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Global instance shared by all modules
+http_session = create_session()
+
+_client_session: Optional[aiohttp.ClientSession] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+
+    The session is bound to the running event loop, so it must be closed with
+    `close_http_session` before that loop finishes.
+
+    Unlike the requests session, it does not retry by itself: page fetches are
+    retried by `fetch_page` (with backoff and Retry-After), while sitemap fetches
+    and HEAD probes are tried once.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    global _client_session
+    if _client_session is None or _client_session.closed:
+        connector = aiohttp.TCPConnector(limit=128, limit_per_host=8, ttl_dns_cache=300)
+        # aiohttp negotiates Accept-Encoding itself based on the codecs it has available (br needs Brotli)
+        headers = {name: value for name, value in HEADERS.items() if name != 'Accept-Encoding'}
+        _client_session = aiohttp.ClientSession(connector=connector, headers=headers)
+    return _client_session
+
+async def close_http_session() -> None:
+    """Close the shared aiohttp session if one is open."""
+    global _client_session
+    if _client_session is not None and not _client_session.closed:
+        await _client_session.close()
+    _client_session = None
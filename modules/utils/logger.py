@@ -1,10 +1,13 @@
 # logger.py
 
+import atexit
 import logging
 import json
 import os
+import queue
+import re
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
 
@@ -28,14 +31,30 @@ class SensitiveDataFilter(logging.Filter):
     def __init__(self, patterns):
         super().__init__()
         self.patterns = patterns
+        # One alternation scans each message once; longest first so overlapping patterns mask fully
+        self._regex = re.compile('|'.join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)))
 
     def filter(self, record):
-        message = record.getMessage()
-        for pattern in self.patterns:
-            message = message.replace(pattern, "*" * len(pattern))
+        message = self._regex.sub(lambda m: "*" * len(m.group(0)), record.getMessage())
         record.msg = message
+        # The message is already formatted; stop it being formatted again with the args
+        record.args = ()
         return True
 
+# Background thread writing queued records to the console and the log file
+_log_listener: Optional[QueueListener] = None
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        # Flushes any queued records before returning
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
+
 def configure_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
@@ -44,35 +63,43 @@ def configure_logging(
     sensitive_patterns: Optional[list] = None,
     use_json: bool = False
 ):
+    global _log_listener
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
     # Remove all existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_log_listener()
 
     formatter = JSONFormatter() if use_json else SimpleFormatter()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler (if log_file is specified)
     if log_file:
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         file_handler = RotatingFileHandler(
-            log_file, maxBytes=max_file_size, backupCount=backup_count
+            log_file, maxBytes=max_file_size, backupCount=backup_count, encoding='utf-8'
         )
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
     # Sensitive data filter
     if sensitive_patterns:
         sensitive_filter = SensitiveDataFilter(sensitive_patterns)
-        for handler in root_logger.handlers:
+        for handler in handlers:
             handler.addFilter(sensitive_filter)
 
+    # Console and disk writes happen on the listener thread; logging calls only enqueue the record
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    root_logger.addHandler(QueueHandler(log_queue))
+
     # Log the configuration
     root_logger.debug(f"Logging configured. Level: {log_level}, File: {log_file if log_file else 'None'}")
 
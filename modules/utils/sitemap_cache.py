@@ -0,0 +1,156 @@
+"""
+Module for caching sitemaps on disk so repeat scrapes can re-fetch them conditionally.
+
+Sitemaps served with an ETag or Last-Modified header are saved along with those
+validators. The next run sends If-None-Match / If-Modified-Since, and on a
+304 Not Modified response the saved copy is parsed instead of downloading the body again.
+"""
+
+import os
+import json
+import hashlib
+from typing import IO, Dict, Optional
+from config import SITEMAP_CACHE_DIR
+
+from modules.utils.logger import get_logger
+logging = get_logger(__name__)
+
+class SitemapCache:
+    """
+    An on-disk cache of sitemap bodies keyed by URL.
+
+    Attributes:
+        cache_dir (str): Directory holding the cached bodies and the index.
+        index_path (str): Path of the JSON index mapping each URL to its validators.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache. Nothing is read from disk until the cache is first used.
+
+        Args:
+            cache_dir (str): Directory holding the cached bodies and the index.
+        """
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._entries: Optional[Dict[str, Dict[str, Optional[str]]]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """The index of cached URLs, loaded on first access."""
+        if self._entries is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                logging.warning("Ignoring unreadable sitemap cache index %s: %s", self.index_path, str(e))
+                self._entries = {}
+        return self._entries
+
+    def body_path(self, url: str) -> str:
+        """
+        Get the path of the cached body for a URL.
+
+        Args:
+            url (str): The sitemap URL.
+
+        Returns:
+            str: The path the body is (or would be) cached at.
+        """
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.xml')
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Get the request headers for a conditional GET of a cached sitemap.
+
+        Args:
+            url (str): The sitemap URL.
+
+        Returns:
+            Dict[str, str]: If-None-Match and/or If-Modified-Since, or an empty dict if
+            the URL has no usable cached copy.
+        """
+        entry = self.entries.get(url)
+        if not entry or not os.path.exists(self.body_path(url)):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def is_cacheable(headers) -> bool:
+        """
+        Check whether a response carries validators that allow a conditional re-fetch.
+
+        Args:
+            headers: The response headers.
+
+        Returns:
+            bool: True if the response has an ETag or Last-Modified header.
+        """
+        return 'ETag' in headers or 'Last-Modified' in headers
+
+    def open_body(self, url: str) -> IO[bytes]:
+        """
+        Open a temporary file to stream a sitemap body into.
+
+        Pass it to `commit` once the body is complete, or to `discard` on failure.
+
+        Args:
+            url (str): The sitemap URL.
+
+        Returns:
+            IO[bytes]: The temporary file, opened for binary writing.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return open(self.body_path(url) + '.part', 'wb')
+
+    def commit(self, url: str, body_file: IO[bytes], headers) -> None:
+        """
+        Keep a fully written body and record the response's validators for it.
+
+        Args:
+            url (str): The sitemap URL.
+            body_file (IO[bytes]): The file from `open_body`.
+            headers: The response headers.
+        """
+        body_file.close()
+        os.replace(body_file.name, self.body_path(url))
+        self.entries[url] = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        self._dirty = True
+
+    def discard(self, body_file: IO[bytes]) -> None:
+        """
+        Drop a partially written body.
+
+        Args:
+            body_file (IO[bytes]): The file from `open_body`.
+        """
+        body_file.close()
+        try:
+            os.remove(body_file.name)
+        except OSError:
+            pass
+
+    def save(self) -> None:
+        """Write the index to disk if it has changed."""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = self.index_path + '.part'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            logging.warning("Could not save sitemap cache index %s: %s", self.index_path, str(e))
+
+# Global instance of SitemapCache
+sitemap_cache = SitemapCache(SITEMAP_CACHE_DIR)
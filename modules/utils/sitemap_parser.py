@@ -1,15 +1,29 @@
 # sitemap_parser.py
 
-import requests
-import xml.etree.ElementTree as ET
-from urllib.parse import urljoin
-from typing import Set, Optional
-from ..processors.url_processor import is_valid_url
+import io
+import asyncio
+import aiohttp
+from lxml import etree
+from urllib.parse import urljoin, urlsplit
+from typing import IO, Iterable, Iterator, Set, Optional, Tuple, Union
+from ..processors.url_processor import is_valid_url_fast
+from modules.utils.http_session import get_http_session
+from modules.utils.sitemap_cache import sitemap_cache
 from modules.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def get_all_urls(base_url: str) -> Set[str]:
+# Common sitemap locations, in order of preference
+SITEMAP_LOCATIONS = [
+    'sitemap.xml', 'sitemap_index.xml', 'sitemap/', 'sitemap1.xml',
+    'post-sitemap.xml', 'page-sitemap.xml', 'sitemapindex.xml',
+    'sitemap-index.xml', 'wp-sitemap.xml'
+]
+
+# Read size when streaming sub-sitemaps into the XML parser
+SITEMAP_CHUNK_SIZE = 64 * 1024
+
+async def get_all_urls(base_url: str) -> Set[str]:
     """
     Get all URLs from the sitemap of the given base URL.
 
@@ -19,9 +33,12 @@ def get_all_urls(base_url: str) -> Set[str]:
     Returns:
         Set[str]: A set of all URLs found in the sitemap.
     """
-    return sorted(set(parse_sitemap(base_url)))
+    try:
+        return sorted(set(await parse_sitemap(base_url)))
+    finally:
+        sitemap_cache.save()
 
-def parse_sitemap(base_url: str) -> Set[str]:
+async def parse_sitemap(base_url: str) -> Set[str]:
     """
     Parse the sitemap of the given base URL.
 
@@ -31,12 +48,12 @@ def parse_sitemap(base_url: str) -> Set[str]:
     Returns:
         Set[str]: A set of URLs found in the sitemap.
     """
-    sitemap_content = fetch_sitemap(base_url)
+    sitemap_content = await fetch_sitemap(base_url)
     if sitemap_content:
-        return parse_sitemap_xml(sitemap_content, base_url)
+        return await parse_sitemap_xml(sitemap_content, base_url)
     return set()
 
-def fetch_sitemap(base_url: str) -> Optional[str]:
+async def fetch_sitemap(base_url: str) -> Optional[bytes]:
     """
     Fetch the sitemap content from various possible locations.
 
@@ -44,58 +61,102 @@ def fetch_sitemap(base_url: str) -> Optional[str]:
         base_url (str): The base URL of the website.
 
     Returns:
-        Optional[str]: The content of the sitemap if found, None otherwise.
-    """
-    sitemap_locations = [
-        'sitemap.xml', 'sitemap_index.xml', 'sitemap/', 'sitemap1.xml',
-        'post-sitemap.xml', 'page-sitemap.xml', 'sitemapindex.xml',
-        'sitemap-index.xml', 'wp-sitemap.xml'
-    ]
-    
-    for location in sitemap_locations:
-        full_url = urljoin(base_url, location)
+        Optional[bytes]: The raw content of the sitemap if found, None otherwise.
+    """
+    candidate_urls = [urljoin(base_url, location) for location in SITEMAP_LOCATIONS]
+    session = await get_http_session()
+    timeout = aiohttp.ClientTimeout(total=10)
+
+    # Probe every candidate at once so missing locations cost one round trip in total
+    probes = await asyncio.gather(*(probe_sitemap_url(session, url) for url in candidate_urls))
+
+    # Take the first hit in priority order, not completion order
+    for full_url, found in zip(candidate_urls, probes):
+        if not found:
+            continue
         try:
-            response = requests.get(full_url, timeout=10)
-            response.raise_for_status()
-            if 'xml' in response.headers.get('Content-Type', ''):
-                logger.info(f"Sitemap fetched from {full_url}")
-                return response.text
-        except requests.RequestException as e:
+            headers = sitemap_cache.conditional_headers(full_url)
+            async with session.get(full_url, headers=headers, timeout=timeout) as response:
+                if response.status == 304:
+                    logger.info(f"Sitemap at {full_url} not modified; using cached copy")
+                    with open(sitemap_cache.body_path(full_url), 'rb') as f:
+                        return f.read()
+                response.raise_for_status()
+                if 'xml' in response.headers.get('Content-Type', ''):
+                    logger.info(f"Sitemap fetched from {full_url}")
+                    content = await response.read()
+                    if sitemap_cache.is_cacheable(response.headers):
+                        body_file = sitemap_cache.open_body(full_url)
+                        body_file.write(content)
+                        sitemap_cache.commit(full_url, body_file, response.headers)
+                    return content
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
             logger.debug(f"Failed to fetch sitemap from {full_url}: {str(e)}")
-    
+
     logger.warning("No sitemap found.")
     return None
 
-def parse_sitemap_xml(xml_content: str, base_url: str) -> Set[str]:
+async def probe_sitemap_url(session: aiohttp.ClientSession, url: str) -> bool:
+    """
+    Check with a HEAD request whether a candidate sitemap location exists.
+
+    Args:
+        session (aiohttp.ClientSession): The session to send the request on.
+        url (str): The candidate sitemap URL.
+
+    Returns:
+        bool: True if the location looks like a sitemap or the server does not
+        support HEAD (so a GET is needed to tell), False otherwise.
+    """
+    try:
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=5), allow_redirects=True) as response:
+            if response.status in (405, 501):
+                return True
+            return response.ok and 'xml' in response.headers.get('Content-Type', '')
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug(f"Sitemap probe failed for {url}: {str(e)}")
+        return False
+
+async def parse_sitemap_xml(xml_content: Union[str, bytes], base_url: str) -> Set[str]:
     """
     Parse the XML content of a sitemap.
 
     Args:
-        xml_content (str): The XML content of the sitemap.
+        xml_content (Union[str, bytes]): The XML content of the sitemap. Raw bytes are
+            preferred so the parser can honour the document's declared encoding.
         base_url (str): The base URL of the website.
 
     Returns:
         Set[str]: A set of URLs found in the sitemap.
     """
     try:
-        root = ET.fromstring(xml_content)
+        base_netloc = urlsplit(base_url).netloc
         urls = set()
-        for elem in root.iter():
-            if 'loc' in elem.tag:
-                url = elem.text.strip()
-                if url.endswith('.xml'):
-                    urls.update(parse_sub_sitemap(url, base_url))
-                elif is_valid_url(url, base_url):
-                    urls.add(url)
-        return urls
-    except ET.ParseError:
+        sub_sitemaps = []
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        for url in iter_sitemap_locs(io.BytesIO(xml_content)):
+            if url.endswith('.xml'):
+                sub_sitemaps.append(url)
+            elif is_valid_url_fast(url, base_netloc):
+                urls.add(url)
+    except etree.XMLSyntaxError:
         logger.error("Error parsing XML content.")
         return set()
 
-def parse_sub_sitemap(url: str, base_url: str) -> Set[str]:
+    # Fetch sub-sitemaps concurrently; the shared connector caps connections per host
+    for sub_urls in await asyncio.gather(*(parse_sub_sitemap(url, base_url) for url in sub_sitemaps)):
+        urls.update(sub_urls)
+    return urls
+
+async def parse_sub_sitemap(url: str, base_url: str) -> Set[str]:
     """
     Parse a sub-sitemap referenced in the main sitemap.
 
+    The response body is fed to the XML parser chunk by chunk as it arrives
+    instead of being buffered whole. Sub-sitemaps cached by an earlier run are
+    re-fetched conditionally and parsed from disk when unchanged.
+
     Args:
         url (str): The URL of the sub-sitemap.
         base_url (str): The base URL of the website.
@@ -103,12 +164,77 @@ def parse_sub_sitemap(url: str, base_url: str) -> Set[str]:
     Returns:
         Set[str]: A set of URLs found in the sub-sitemap.
     """
+    base_netloc = urlsplit(base_url).netloc
+    urls = set()
+    body_file = None
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        root = ET.fromstring(response.text)
-        return {elem.text.strip() for elem in root.iter() 
-                if 'loc' in elem.tag and is_valid_url(elem.text.strip(), base_url)}
-    except (requests.RequestException, ET.ParseError) as e:
+        session = await get_http_session()
+        headers = sitemap_cache.conditional_headers(url)
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 304:
+                logger.debug(f"Sub-sitemap {url} not modified; using cached copy")
+                with open(sitemap_cache.body_path(url), 'rb') as f:
+                    return {loc for loc in iter_sitemap_locs(f) if is_valid_url_fast(loc, base_netloc)}
+            response.raise_for_status()
+            if sitemap_cache.is_cacheable(response.headers):
+                body_file = sitemap_cache.open_body(url)
+            # Sitemaps are untrusted input: never resolve entities
+            parser = etree.XMLPullParser(events=('end',), tag='{*}loc', resolve_entities=False)
+            async for chunk in response.content.iter_chunked(SITEMAP_CHUNK_SIZE):
+                parser.feed(chunk)
+                if body_file is not None:
+                    body_file.write(chunk)
+                urls.update(loc for loc in collect_locs(parser.read_events()) if is_valid_url_fast(loc, base_netloc))
+            parser.close()
+            urls.update(loc for loc in collect_locs(parser.read_events()) if is_valid_url_fast(loc, base_netloc))
+        if body_file is not None:
+            sitemap_cache.commit(url, body_file, response.headers)
+            body_file = None
+        return urls
+    except (aiohttp.ClientError, asyncio.TimeoutError, etree.XMLSyntaxError, OSError) as e:
         logger.error(f"Error parsing sub-sitemap {url}: {str(e)}")
-        return set()
\ No newline at end of file
+        return set()
+    finally:
+        if body_file is not None:
+            sitemap_cache.discard(body_file)
+
+def iter_sitemap_locs(source: IO) -> Iterator[str]:
+    """
+    Stream the <loc> values out of a sitemap document.
+
+    Uses lxml's libxml2-backed iterparse filtered to <loc> elements in any
+    namespace. Finished entries are discarded as parsing proceeds, so memory use
+    stays flat instead of growing with the size of the sitemap.
+
+    Args:
+        source (IO): A binary file-like object containing the sitemap XML.
+
+    Returns:
+        Iterator[str]: Each non-empty <loc> value, stripped of whitespace.
+
+    Raises:
+        etree.XMLSyntaxError: If the XML is malformed (raised while iterating).
+    """
+    # Sitemaps are untrusted input: never resolve entities
+    return collect_locs(etree.iterparse(source, events=('end',), tag='{*}loc', resolve_entities=False))
+
+def collect_locs(events: Iterable[Tuple[str, etree._Element]]) -> Iterator[str]:
+    """
+    Yield <loc> values from parser 'end' events, discarding finished entries.
+
+    Args:
+        events (Iterable[Tuple[str, etree._Element]]): 'end' events for <loc>
+            elements, from iterparse or an XMLPullParser.
+
+    Yields:
+        str: Each non-empty <loc> value, stripped of whitespace.
+    """
+    for _, elem in events:
+        if elem.text:
+            yield elem.text.strip()
+        # Drop this entry's contents and every <url>/<sitemap> entry before it
+        entry = elem.getparent()
+        elem.clear(keep_tail=True)
+        if entry is not None:
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
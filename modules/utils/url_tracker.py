@@ -2,34 +2,57 @@
 Module for tracking visited URLs and managing a common pool of URLs to be processed across all scrapers.
 """
 
-import asyncio
+import hashlib
 from typing import Set, Optional
 from collections import deque
 
 from modules.utils.logger import get_logger
 logging = get_logger(__name__)
 
+def url_digest(url: str) -> int:
+    """
+    Compute a 64-bit digest of a URL.
+
+    At a million URLs the chance of any collision is around 3e-8, so the digest
+    can stand in for the full string in visited-URL bookkeeping.
+
+    Args:
+        url (str): The URL to hash.
+
+    Returns:
+        int: The unsigned 64-bit digest.
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
 class URLTracker:
     """
     A class to manage URL tracking and provide a common pool of URLs for scrapers.
 
     This class handles visited URL tracking, maintains a queue of URLs to be processed,
-    and provides thread-safe operations for adding and retrieving URLs.
+    and provides operations for adding and retrieving URLs.
+
+    No method awaits, and scrapers share one event loop, so every operation
+    runs to completion without interleaving and no lock is needed.
 
     Attributes:
-        visited_urls (Set[str]): A set of URLs that have been visited.
+        visited_digests (Set[int]): 64-bit digests of the URLs that have been visited,
+            stored instead of the strings to keep memory flat on large crawls.
         url_pool (deque): A queue of URLs to be processed.
-        lock (asyncio.Lock): A lock for ensuring thread-safe operations.
+        _pool_set (Set[str]): The URLs currently in url_pool, for O(1) membership tests.
+        _in_progress (Set[str]): URLs taken from the pool whose processing has not finished.
+        seen_fingerprints (Set[str]): URL templates already claimed for crawling.
     """
 
     def __init__(self):
         """Initialize the URLTracker."""
-        self.visited_urls: Set[str] = set()
+        self.visited_digests: Set[int] = set()
         self.url_pool: deque = deque()
-        self.lock = asyncio.Lock()
+        self._pool_set: Set[str] = set()
+        self._in_progress: Set[str] = set()
+        self.seen_fingerprints: Set[str] = set()
         logging.debug("URL tracker initialized.")
 
-    async def is_visited(self, url: str) -> bool:
+    def is_visited(self, url: str) -> bool:
         """
         Check if a URL has been visited.
 
@@ -39,55 +62,97 @@ class URLTracker:
         Returns:
             bool: True if the URL has been visited, False otherwise.
         """
-        return url in self.visited_urls
+        return url_digest(url) in self.visited_digests
 
-    async def mark_visited(self, url: str) -> None:
+    def mark_visited(self, url: str) -> None:
         """
         Mark a URL as visited.
 
         Args:
             url (str): The URL to mark as visited.
         """
-        async with self.lock:
-            self.visited_urls.add(url)
-            logging.debug(f"Marked URL as visited: {url}")
+        self.visited_digests.add(url_digest(url))
+        logging.debug("Marked URL as visited: %s", url)
 
-    async def add_to_pool(self, url: str) -> None:
+    def add_to_pool(self, url: str) -> None:
         """
         Add a URL to the processing pool if it hasn't been visited.
 
         Args:
             url (str): The URL to add to the pool.
         """
-        if not await self.is_visited(url):
-            async with self.lock:
-                self.url_pool.append(url)
-                logging.debug(f"Added URL to pool: {url}")
+        if url not in self._pool_set and url not in self._in_progress and not self.is_visited(url):
+            self._pool_set.add(url)
+            self.url_pool.append(url)
+            logging.debug("Added URL to pool: %s", url)
 
-    async def get_next_url(self) -> Optional[str]:
+    def get_next_url(self) -> Optional[str]:
         """
         Get the next URL from the pool to process.
 
+        The URL counts as in progress until `finish_url` is called for it, so it is
+        not queued again if it is rediscovered in the meantime.
+
         Returns:
             Optional[str]: The next URL to process, or None if the pool is empty.
         """
-        async with self.lock:
-            return self.url_pool.popleft() if self.url_pool else None
+        if not self.url_pool:
+            return None
+        url = self.url_pool.popleft()
+        self._pool_set.discard(url)
+        self._in_progress.add(url)
+        return url
 
-    async def add_bulk_to_pool(self, urls: Set[str]) -> None:
+    def finish_url(self, url: str) -> None:
         """
-        Add multiple URLs to the processing pool.
+        Mark a URL returned by `get_next_url` as no longer in progress.
+
+        Args:
+            url (str): The URL whose processing has finished.
+        """
+        self._in_progress.discard(url)
+
+    def get_in_progress_count(self) -> int:
+        """
+        Get the number of URLs currently being processed.
+
+        Returns:
+            int: The number of URLs taken from the pool and not yet finished.
+        """
+        return len(self._in_progress)
+
+    def add_bulk_to_pool(self, urls: Set[str]) -> None:
+        """
+        Add multiple URLs to the processing pool, skipping visited, queued and in-progress ones.
 
         Args:
             urls (Set[str]): A set of URLs to add to the pool.
         """
-        async with self.lock:
-            for url in urls:
-                if url not in self.visited_urls:
-                    self.url_pool.append(url)
-            logging.info(f"Added {len(urls)} URLs to the pool.")
+        # dict.fromkeys drops duplicates within the batch while keeping its order
+        new_urls = [
+            url for url in dict.fromkeys(urls)
+            if url not in self._pool_set and url not in self._in_progress and not self.is_visited(url)
+        ]
+        self._pool_set.update(new_urls)
+        self.url_pool.extend(new_urls)
+        logging.info("Added %d URLs to the pool.", len(new_urls))
+
+    def claim_fingerprint(self, fingerprint: str) -> bool:
+        """
+        Claim a URL template so only the first URL matching it is crawled.
+
+        Args:
+            fingerprint (str): The URL's fingerprint, from `url_fingerprint`.
+
+        Returns:
+            bool: True if the fingerprint had not been claimed before, False otherwise.
+        """
+        if fingerprint in self.seen_fingerprints:
+            return False
+        self.seen_fingerprints.add(fingerprint)
+        return True
 
-    async def get_pool_size(self) -> int:
+    def get_pool_size(self) -> int:
         """
         Get the current size of the URL pool.
 
@@ -96,16 +161,16 @@ class URLTracker:
         """
         return len(self.url_pool)
 
-    async def get_visited_count(self) -> int:
+    def get_visited_count(self) -> int:
         """
         Get the number of visited URLs.
 
         Returns:
             int: The number of visited URLs.
         """
-        return len(self.visited_urls)
+        return len(self.visited_digests)
 
-    async def is_pool_empty(self) -> bool:
+    def is_pool_empty(self) -> bool:
         """
         Check if the URL pool is empty.
 
@@ -114,22 +179,23 @@ class URLTracker:
         """
         return len(self.url_pool) == 0
 
-    async def return_url_to_pool(self, url: str) -> None:
+    def return_url_to_pool(self, url: str) -> None:
         """
         Return a URL to the pool, typically used when processing fails.
 
         Args:
             url (str): The URL to return to the pool.
         """
-        async with self.lock:
+        if url not in self._pool_set:
+            self._pool_set.add(url)
             self.url_pool.appendleft(url)
-            logging.debug(f"Returned URL to pool: {url}")
+        logging.debug("Returned URL to pool: %s", url)
 
-    async def clear_pool(self) -> None:
+    def clear_pool(self) -> None:
         """Clear all URLs from the pool."""
-        async with self.lock:
-            self.url_pool.clear()
-            logging.info("URL pool cleared.")
+        self.url_pool.clear()
+        self._pool_set.clear()
+        logging.info("URL pool cleared.")
 
 # Global instance of URLTracker
 url_tracker = URLTracker()
\ No newline at end of file
@@ -1,37 +1,75 @@
 # utils.py
 
-import requests
-import json
-import io
+import aiohttp
 import asyncio
 import time
 import random
-from urllib.parse import urlparse
+import zlib
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 from collections import defaultdict
-from config import RATE_LIMIT_MIN, RATE_LIMIT_MAX
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+from config import RATE_LIMIT_MIN, RATE_LIMIT_MAX, MAX_CONCURRENT_REQUESTS_PER_DOMAIN, REQUEST_TIMEOUT, HEAD_FAILURE_TTL
 
 from modules.utils.logger import get_logger
 from modules.utils.url_tracker import url_tracker
+from modules.utils.http_session import get_http_session
+from modules.utils.file_handler import dumps_json
 
 logging = get_logger(__name__)
 
+# The same URL is parsed by several helpers as it moves through the scrape loop.
+# urlsplit skips urlparse's ';params' pass, which none of these helpers need.
+cached_urlsplit = lru_cache(maxsize=65536)(urlsplit)
+
+# Extensions of image and other media files that are never scraped
+IMAGE_FILE_EXTENSIONS = frozenset(('jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'mp3', 'mp4', 'wav', 'avi', 'mov'))
+
+# Page text is held compressed until output; zlib is used when zstandard isn't installed
+if zstandard is not None:
+    _compress = zstandard.ZstdCompressor(level=3).compress
+    _decompress = zstandard.ZstdDecompressor().decompress
+else:
+    _compress = zlib.compress
+    _decompress = zlib.decompress
+
+# URL -> time of the last failed HEAD request, so unreachable URLs aren't probed repeatedly.
+# Kept in failure order, so expired and excess entries are evicted from the front.
+HEAD_FAILURE_CACHE_SIZE = 4096
+_head_failures = {}
+
+# HEAD-probed content types, oldest entries evicted first
+HEAD_CONTENT_TYPE_CACHE_SIZE = 4096
+_head_content_types = {}
+
 class AsyncRateLimiter:
     """
     Asynchronous rate limiter with per-domain limiting capabilities.
 
     This class provides an asynchronous way to limit the rate of requests
-    to different domains.
+    to different domains. One instance is shared by all scrapers, so each domain's
+    budget holds for the crawl as a whole while different domains proceed in parallel.
 
     Attributes:
         min_delay (float): Minimum delay between requests in seconds.
         max_delay (float): Maximum delay between requests in seconds.
-        last_request_times (defaultdict): Dictionary to store the last request time for each domain.
+        max_concurrent (int): Maximum number of requests in flight per domain.
+        next_request_times (defaultdict): Dictionary to store the earliest monotonic time
+            at which the next request to each domain may be made.
+        semaphores (dict): Per-domain semaphores bounding requests in flight.
     """
 
-    def __init__(self, min_delay=RATE_LIMIT_MIN, max_delay=RATE_LIMIT_MAX):
+    def __init__(self, min_delay=RATE_LIMIT_MIN, max_delay=RATE_LIMIT_MAX, max_concurrent=MAX_CONCURRENT_REQUESTS_PER_DOMAIN):
         self.min_delay = min_delay
         self.max_delay = max_delay
-        self.last_request_times = defaultdict(float)
+        self.max_concurrent = max_concurrent
+        self.next_request_times = defaultdict(float)
+        self.semaphores = {}
 
     async def wait(self, domain):
         """
@@ -40,46 +78,144 @@ class AsyncRateLimiter:
         Args:
             domain (str): The domain for which to wait.
 
-        This method calculates the time elapsed since the last request to the given domain
-        and waits for the remaining time if necessary.
+        Each call reserves the next free slot for the domain and schedules the one
+        after it a random delay later, so concurrent callers queue up instead of
+        all measuring the same elapsed time.
+        """
+        now = time.monotonic()
+        wake = max(now, self.next_request_times[domain])
+        self.next_request_times[domain] = wake + self.min_delay + (self.max_delay - self.min_delay) * random.random()
+        if wake > now:
+            await asyncio.sleep(wake - now)
+
+    @asynccontextmanager
+    async def limit(self, domain):
+        """
+        Hold one of the domain's request slots, waiting for its rate limit first.
+
+        Args:
+            domain (str): The domain about to be requested.
+
+        Usage:
+            async with rate_limiter.limit(domain):
+                ...  # make the request
+        """
+        semaphore = self.semaphores.get(domain)
+        if semaphore is None:
+            semaphore = self.semaphores[domain] = asyncio.Semaphore(self.max_concurrent)
+        async with semaphore:
+            await self.wait(domain)
+            yield
+
+    def penalize(self, domain, seconds):
+        """
+        Hold off all requests to a domain for a while, e.g. as asked by a Retry-After header.
+
+        Args:
+            domain (str): The domain to back off from.
+            seconds (float): How long to wait before the next request to the domain.
         """
-        current_time = time.time()
-        elapsed = current_time - self.last_request_times[domain]
-        delay = random.uniform(self.min_delay, self.max_delay)
-        if elapsed < delay:
-            await asyncio.sleep(delay - elapsed)
-        self.last_request_times[domain] = time.time()
-
-async def get_scraping_stats():
+        resume_at = time.monotonic() + seconds
+        if resume_at > self.next_request_times[domain]:
+            self.next_request_times[domain] = resume_at
+            logging.info("Backing off from %s for %.1f seconds", domain, seconds)
+
+def get_scraping_stats():
     """Get current scraping statistics."""
     return {
-        'urls_in_pool': await url_tracker.get_pool_size(),
-        'urls_visited': await url_tracker.get_visited_count(),
-        'is_pool_empty': await url_tracker.is_pool_empty(),
+        'urls_in_pool': url_tracker.get_pool_size(),
+        'urls_visited': url_tracker.get_visited_count(),
+        'is_pool_empty': url_tracker.is_pool_empty(),
     }
 
-def get_pdf_data(file_path_or_url):
-    pdf_data = None     
-    # Determine if the input is a URL or local file path
-    parsed = urlparse(file_path_or_url)
-    if parsed.scheme in ('http', 'https'):
-        response = requests.get(file_path_or_url)
-        response.raise_for_status()
-        pdf_data = io.BytesIO(response.content)
-    else:
-        pdf_data = open(file_path_or_url, 'rb')
-    return pdf_data
+def compress_text(text):
+    """
+    Compress page text for storage in the scrape results.
+
+    Args:
+        text (str): The text to compress, or None.
+
+    Returns:
+        bytes: The compressed UTF-8 text, or None if text is None.
+    """
+    if text is None:
+        return None
+    return _compress(text.encode('utf-8'))
+
+def decompress_text(content):
+    """
+    Restore page text stored with `compress_text`.
+
+    Args:
+        content (bytes or str): Compressed text, or text that was stored uncompressed.
+
+    Returns:
+        str: The original text; str and None values are returned unchanged.
+    """
+    if isinstance(content, bytes):
+        return _decompress(content).decode('utf-8')
+    return content
 
 def is_image_file_extension(path):
-    image_extensions = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'mp3', 'mp4', 'wav', 'avi', 'mov']
-    return path.split('.')[-1].lower() in image_extensions
+    return path.rpartition('.')[2].lower() in IMAGE_FILE_EXTENSIONS
 
-def is_image_content_type(url):
-    try:
-        response = requests.head(url)
+async def _head_content_type(url):
+    if url in _head_content_types:
+        return _head_content_types[url]
+
+    session = await get_http_session()
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with session.head(url, allow_redirects=True, timeout=timeout) as response:
         content_type = response.headers.get('Content-Type', '')
-        return content_type.startswith('image/')
-    except requests.RequestException:
+
+    if len(_head_content_types) >= HEAD_CONTENT_TYPE_CACHE_SIZE:
+        _head_content_types.pop(next(iter(_head_content_types)))
+    _head_content_types[url] = content_type
+    return content_type
+
+def _record_head_failure(url):
+    """
+    Remember that a HEAD request to a URL failed, evicting expired and excess entries.
+
+    Args:
+        url (str): The URL whose HEAD request failed.
+    """
+    now = time.monotonic()
+    _head_failures.pop(url, None)
+    while _head_failures:
+        oldest_url = next(iter(_head_failures))
+        if now - _head_failures[oldest_url] < HEAD_FAILURE_TTL and len(_head_failures) < HEAD_FAILURE_CACHE_SIZE:
+            break
+        del _head_failures[oldest_url]
+    _head_failures[url] = now
+
+async def is_image_content_type(url):
+    """
+    Check if a URL points to an image or other media file.
+
+    The file extension is checked first; a HEAD request is only issued on the
+    shared aiohttp session when the extension is inconclusive. HEAD results are
+    cached for the run, and failed requests are not retried for HEAD_FAILURE_TTL seconds.
+
+    Args:
+        url (str): The URL to check.
+
+    Returns:
+        bool: True if the URL points to an image, False otherwise.
+    """
+    if is_image_file_extension(cached_urlsplit(url).path):
+        return True
+
+    failed_at = _head_failures.get(url)
+    if failed_at is not None:
+        if time.monotonic() - failed_at < HEAD_FAILURE_TTL:
+            return False
+        del _head_failures[url]
+
+    try:
+        return (await _head_content_type(url)).startswith('image/')
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        _record_head_failure(url)
         logging.error(f"Error checking content type for {url}")
         return False
 
@@ -100,21 +236,28 @@ def format_output(results, output_format):
     Raises:
         ValueError: If an invalid output format is specified
     """
-    sorted_results = dict(sorted(results.items()))
+    # Scrapers store discovered URLs unsorted and page text compressed; finish each entry once, here
+    for data in results.values():
+        if 'discovered_urls' in data:
+            data['discovered_urls'] = sorted(data['discovered_urls'])
+        if 'content' in data:
+            data['content'] = decompress_text(data['content'])
 
     if output_format == 'csv':
         csv_data = [['URL', 'Content', 'Discovered URLs', 'Metadata']]
-        for url, data in sorted_results.items():
-            metadata_str = json.dumps(data.get('metadata', {}))
+        for url in sorted(results):
+            data = results[url]
+            metadata_str = dumps_json(data.get('metadata', {})).decode('utf-8')
             csv_data.append([
                 url, 
                 data['content'], 
-                ', '.join(data['discovered_urls']),
+                ', '.join(data.get('discovered_urls', [])),
                 metadata_str
             ])
         return csv_data
     elif output_format == 'json':
-        return sorted_results
+        # Keys are sorted when the output is serialized
+        return results
     else:
         raise ValueError(f"Invalid output format: {output_format}")
     
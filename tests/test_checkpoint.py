@@ -0,0 +1,153 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from modules import scraper
+from modules.scraper import WebsiteScraper
+from modules.utils.checkpoint import CrawlCheckpoint
+from modules.utils.url_tracker import URLTracker
+
+BASE_URL = "https://example.com"
+
+class TestCrawlCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "checkpoint.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_record_then_load(self):
+        checkpoint = CrawlCheckpoint(self.path)
+        checkpoint.reset()
+        checkpoint.record(f"{BASE_URL}/a", {'content': "A", 'discovered_urls': [f"{BASE_URL}/b"], 'metadata': {}})
+        checkpoint.record(f"{BASE_URL}/b", {'content': "B", 'discovered_urls': [], 'metadata': {'title': "B"}})
+        checkpoint.close()
+
+        results = CrawlCheckpoint(self.path).load()
+        self.assertEqual(list(results), [f"{BASE_URL}/a", f"{BASE_URL}/b"])
+        self.assertEqual(results[f"{BASE_URL}/a"]['discovered_urls'], [f"{BASE_URL}/b"])
+        self.assertEqual(results[f"{BASE_URL}/b"]['metadata'], {'title': "B"})
+
+    def test_load_skips_truncated_last_line(self):
+        checkpoint = CrawlCheckpoint(self.path)
+        checkpoint.record(f"{BASE_URL}/a", {'content': "A", 'discovered_urls': [], 'metadata': {}})
+        checkpoint.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://example.com/b", "content": "B')
+
+        results = CrawlCheckpoint(self.path).load()
+        self.assertEqual(list(results), [f"{BASE_URL}/a"])
+
+    def test_load_missing_file(self):
+        self.assertEqual(CrawlCheckpoint(self.path).load(), {})
+
+    def test_reset_discards_previous_run(self):
+        checkpoint = CrawlCheckpoint(self.path)
+        checkpoint.record(f"{BASE_URL}/a", {'content': "A"})
+        checkpoint.reset()
+        self.assertEqual(checkpoint.load(), {})
+
+    def test_remove(self):
+        checkpoint = CrawlCheckpoint(self.path)
+        checkpoint.record(f"{BASE_URL}/a", {'content': "A"})
+        checkpoint.remove()
+        self.assertFalse(os.path.exists(self.path))
+
+class TestScraperCheckpoint(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint = CrawlCheckpoint(os.path.join(self.temp_dir, "checkpoint.jsonl"))
+        self.tracker = URLTracker()
+        self.tracker.add_to_pool(BASE_URL)
+        patchers = [
+            patch.object(scraper, 'url_tracker', self.tracker),
+            patch.object(scraper, 'get_selenium_pool', lambda: None),
+            patch.object(scraper, 'process_page', AsyncMock(side_effect=self.fake_process_page)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.checkpoint.close()
+        shutil.rmtree(self.temp_dir)
+
+    async def fake_process_page(self, scraper_id, url, *args, **kwargs):
+        if url == BASE_URL:
+            return 'text/html', "Home", {}, [f"{BASE_URL}/broken"]
+        # process_page reports a failed fetch with empty results rather than raising
+        return None, None, None, []
+
+    async def test_failed_page_is_not_recorded(self):
+        await WebsiteScraper(BASE_URL, 1, True, checkpoint=self.checkpoint).scrape()
+        self.checkpoint.close()
+
+        self.assertTrue(self.tracker.is_visited(f"{BASE_URL}/broken"))
+        self.assertEqual(list(self.checkpoint.load()), [BASE_URL])
+
+class TestResume(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint = CrawlCheckpoint(os.path.join(self.temp_dir, "checkpoint.jsonl"))
+        self.checkpoint.record(BASE_URL, {
+            'content': "Home",
+            'discovered_urls': [f"{BASE_URL}/a", f"{BASE_URL}/b"],
+            'metadata': {},
+        })
+        self.checkpoint.record(f"{BASE_URL}/a", {'content': "A", 'discovered_urls': [BASE_URL], 'metadata': {}})
+        # A failed page, as recorded by an older run
+        self.checkpoint.record(f"{BASE_URL}/c", {'content': None, 'discovered_urls': [], 'metadata': None})
+        self.checkpoint.close()
+
+        self.tracker = URLTracker()
+        self.pool_at_start = None
+        patchers = [
+            patch.object(main, 'url_tracker', self.tracker),
+            patch.object(main, 'get_all_urls', AsyncMock(return_value=[])),
+            patch.object(main, 'close_http_session', AsyncMock()),
+            patch.object(main, 'run_scrapers', AsyncMock(side_effect=self.fake_run_scrapers)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    async def fake_run_scrapers(self, *args, **kwargs):
+        self.pool_at_start = list(self.tracker.url_pool)
+        return {f"{BASE_URL}/b": {'content': "B", 'discovered_urls': [], 'metadata': {}}}
+
+    async def test_resume_skips_scraped_urls(self):
+        output, total = await main.run_scraping(
+            BASE_URL, True, None, 'json', checkpoint=self.checkpoint, resume=True
+        )
+
+        self.assertTrue(self.tracker.is_visited(BASE_URL))
+        self.assertTrue(self.tracker.is_visited(f"{BASE_URL}/a"))
+        # Only the pages found on, or failed by, the interrupted run are queued
+        self.assertFalse(self.tracker.is_visited(f"{BASE_URL}/c"))
+        self.assertEqual(sorted(self.pool_at_start), [f"{BASE_URL}/b", f"{BASE_URL}/c"])
+        self.assertEqual(total, 3)
+        self.assertEqual(set(output['scraped_data']), {BASE_URL, f"{BASE_URL}/a", f"{BASE_URL}/b"})
+
+    async def test_without_resume_starts_over(self):
+        await main.run_scraping(BASE_URL, True, None, 'json', checkpoint=self.checkpoint, resume=False)
+
+        self.assertFalse(self.tracker.is_visited(BASE_URL))
+        self.assertEqual(self.pool_at_start, [BASE_URL])
+        self.assertEqual(self.checkpoint.load(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.utils import file_handler
+from modules.utils.file_handler import dumps_json, list_files, write_json_stream
+
+SCRAPE_DATA = {
+    'scraped_data': {
+        "https://example.com/café": {
+            'metadata': {'title': "Café — menu ☕", 'tags': ["a", "b"]},
+            'content': "Crème brûlée\nÜber 日本語",
+            'discovered_urls': {"https://example.com/b", "https://example.com/a"},
+        },
+        "https://example.com/empty": {'metadata': {}, 'content': None, 'discovered_urls': []},
+    },
+    'nested': [{'x': [1, 2.5, {'y': None}]}, [], {}],
+    'counts': {404: 2, 200: 10},
+    'total': 2,
+}
+
+# What SCRAPE_DATA reads back as: sets become sorted lists, keys become strings
+EXPECTED = json.loads(json.dumps(SCRAPE_DATA, default=sorted))
+
+class TestDirectoryListing(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name in ("a.json", "b.csv"):
+            with open(os.path.join(self.temp_dir, name), 'w', encoding='utf-8') as f:
+                f.write(name)
+        os.mkdir(os.path.join(self.temp_dir, "nested"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_list_files(self):
+        self.assertEqual(sorted(list_files(self.temp_dir)), ["a.json", "b.csv", "nested"])
+
+    def test_empty_directory(self):
+        empty_dir = os.path.join(self.temp_dir, "nested")
+        self.assertEqual(list_files(empty_dir), [])
+
+    def test_missing_directory(self):
+        missing_dir = os.path.join(self.temp_dir, "missing")
+        with self.assertRaises(OSError):
+            list_files(missing_dir)
+
+class TestWriteJsonStream(unittest.TestCase):
+
+    def write(self, data, indent):
+        f = io.BytesIO()
+        write_json_stream(data, f, indent=indent)
+        return f.getvalue()
+
+    def assert_round_trip(self):
+        for indent in (False, True):
+            output = self.write(SCRAPE_DATA, indent)
+            self.assertEqual(json.loads(output), EXPECTED, indent)
+            self.assertEqual(b'\n' in output, indent)
+
+    def test_round_trip(self):
+        self.assert_round_trip()
+
+    def test_round_trip_without_orjson(self):
+        with patch.object(file_handler, 'orjson', None):
+            self.assert_round_trip()
+
+    def test_matches_dumps_json(self):
+        data = {k: v for k, v in SCRAPE_DATA.items() if k != 'counts'}
+        for indent in (False, True):
+            self.assertEqual(self.write(data, indent), dumps_json(data, indent=indent), indent)
+
+    def test_non_str_keys(self):
+        output = self.write({2: "b", 10: "c", 1.5: "a", True: "t", None: "n"}, False)
+        self.assertEqual(json.loads(output), {"1.5": "a", "10": "c", "2": "b", "true": "t", "null": "n"})
+
+    def test_scalars_and_empty_containers(self):
+        for data in ("text", 3, None, [], {}, {"a": {}}):
+            self.assertEqual(json.loads(self.write(data, True)), data)
+
+if __name__ == '__main__':
+    unittest.main()
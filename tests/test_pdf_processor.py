@@ -0,0 +1,70 @@
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+import pypdf
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.processors import pdf_processor
+from modules.processors.pdf_processor import DiskSpool, extract_pdf, fetch_pdf, shutdown_pdf_pool
+from modules.utils.http_session import close_http_session
+
+def make_pdf(title):
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    writer.add_metadata({'/Title': title})
+    body = io.BytesIO()
+    writer.write(body)
+    return body.getvalue()
+
+class TestPdfSpool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pdf = make_pdf("Report")
+        app = web.Application()
+        app.router.add_get('/doc.pdf', self.serve_pdf)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await close_http_session()
+        await self.server.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pdf_pool()
+
+    async def serve_pdf(self, request):
+        return web.Response(body=self.pdf, content_type='application/pdf')
+
+    async def test_small_pdf_stays_in_memory(self):
+        spool = await fetch_pdf(str(self.server.make_url('/doc.pdf')))
+        try:
+            self.assertIsInstance(spool, io.BytesIO)
+            self.assertEqual(spool.read(), self.pdf)
+        finally:
+            spool.close()
+
+    async def test_large_pdf_is_parsed_from_disk(self):
+        with patch.object(pdf_processor, 'PDF_SPOOL_MAX_SIZE', 64):
+            spool = await fetch_pdf(str(self.server.make_url('/doc.pdf')))
+        try:
+            self.assertIsInstance(spool, DiskSpool)
+            self.assertTrue(os.path.exists(spool.name))
+            self.assertEqual(spool.read(), self.pdf)
+            spool.seek(0)
+
+            text, metadata = await extract_pdf(spool)
+            self.assertEqual(text, "")
+            self.assertEqual(metadata['/Title'], "Report")
+        finally:
+            spool.close()
+        self.assertFalse(os.path.exists(spool.name))
+
+if __name__ == '__main__':
+    unittest.main()
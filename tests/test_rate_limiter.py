@@ -0,0 +1,99 @@
+import os
+import sys
+import asyncio
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.utils.utils import AsyncRateLimiter
+
+DOMAIN = "example.com"
+
+class TestAsyncRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(seconds):
+            self.sleeps.append(seconds)
+            await real_sleep(0)
+
+        patchers = [
+            patch('modules.utils.utils.time.monotonic', side_effect=lambda: self.now),
+            patch('modules.utils.utils.asyncio.sleep', side_effect=fake_sleep),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_first_request_does_not_wait(self):
+        limiter = AsyncRateLimiter(min_delay=2, max_delay=2)
+        await limiter.wait(DOMAIN)
+        self.assertEqual(self.sleeps, [])
+
+    async def test_concurrent_waiters_are_spaced_by_delay(self):
+        limiter = AsyncRateLimiter(min_delay=2, max_delay=2, max_concurrent=3)
+
+        async def request():
+            async with limiter.limit(DOMAIN):
+                pass
+
+        await asyncio.gather(request(), request(), request())
+        self.assertEqual(sorted(self.sleeps), [2.0, 4.0])
+        self.assertEqual(limiter.next_request_times[DOMAIN], 106.0)
+
+    async def test_elapsed_time_counts_towards_delay(self):
+        limiter = AsyncRateLimiter(min_delay=2, max_delay=2)
+        await limiter.wait(DOMAIN)
+        self.now = 101.5
+        await limiter.wait(DOMAIN)
+        self.assertEqual(self.sleeps, [0.5])
+
+    async def test_delay_is_drawn_from_range(self):
+        limiter = AsyncRateLimiter(min_delay=1, max_delay=3)
+        with patch('modules.utils.utils.random.random', return_value=0.5):
+            await limiter.wait(DOMAIN)
+            await limiter.wait(DOMAIN)
+        self.assertEqual(self.sleeps, [2.0])
+
+    async def test_domains_are_limited_independently(self):
+        limiter = AsyncRateLimiter(min_delay=2, max_delay=2)
+        await limiter.wait(DOMAIN)
+        await limiter.wait("other.com")
+        self.assertEqual(self.sleeps, [])
+
+    async def test_penalize_pushes_out_next_slot(self):
+        limiter = AsyncRateLimiter(min_delay=2, max_delay=2)
+        await limiter.wait(DOMAIN)
+        limiter.penalize(DOMAIN, 30)
+        await limiter.wait(DOMAIN)
+        self.assertEqual(self.sleeps, [30.0])
+
+    async def test_penalize_never_pulls_in_next_slot(self):
+        limiter = AsyncRateLimiter(min_delay=10, max_delay=10)
+        await limiter.wait(DOMAIN)
+        limiter.penalize(DOMAIN, 1)
+        self.assertEqual(limiter.next_request_times[DOMAIN], 110.0)
+
+    async def test_limit_caps_requests_in_flight(self):
+        limiter = AsyncRateLimiter(min_delay=0, max_delay=0, max_concurrent=2)
+        in_flight = 0
+        peak = 0
+
+        async def request():
+            nonlocal in_flight, peak
+            async with limiter.limit(DOMAIN):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+
+        await asyncio.gather(*(request() for _ in range(5)))
+        self.assertEqual(peak, 2)
+
+if __name__ == '__main__':
+    unittest.main()
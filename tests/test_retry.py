@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import asyncio
+import unittest
+from email.utils import formatdate
+import aiohttp
+from selenium.common.exceptions import WebDriverException
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.processors.content_processor import get_retry_after, is_retryable_error
+
+def http_error(status, headers=None):
+    return aiohttp.ClientResponseError(request_info=None, history=(), status=status, headers=headers)
+
+class TestIsRetryableError(unittest.TestCase):
+
+    def test_client_errors_are_not_retried(self):
+        for status in (400, 401, 403, 404, 410):
+            self.assertFalse(is_retryable_error(http_error(status)), status)
+
+    def test_timeout_and_rate_limit_statuses_are_retried(self):
+        self.assertTrue(is_retryable_error(http_error(408)))
+        self.assertTrue(is_retryable_error(http_error(429)))
+
+    def test_server_errors_are_retried(self):
+        for status in (500, 502, 503, 504):
+            self.assertTrue(is_retryable_error(http_error(status)), status)
+
+    def test_transient_failures_are_retried(self):
+        self.assertTrue(is_retryable_error(aiohttp.ClientConnectionError()))
+        self.assertTrue(is_retryable_error(asyncio.TimeoutError()))
+        self.assertTrue(is_retryable_error(WebDriverException("browser crashed")))
+
+class TestGetRetryAfter(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(get_retry_after(http_error(429, {'Retry-After': '120'})), 120.0)
+        self.assertEqual(get_retry_after(http_error(503, {'Retry-After': ' 0 '})), 0.0)
+
+    def test_http_date(self):
+        value = formatdate(time.time() + 30, usegmt=True)
+        delay = get_retry_after(http_error(503, {'Retry-After': value}))
+        self.assertGreater(delay, 25)
+        self.assertLessEqual(delay, 30)
+
+    def test_http_date_in_the_past(self):
+        value = formatdate(time.time() - 3600, usegmt=True)
+        self.assertEqual(get_retry_after(http_error(503, {'Retry-After': value})), 0.0)
+
+    def test_invalid_values(self):
+        for value in ('soon', '-5', '1.5', ''):
+            self.assertIsNone(get_retry_after(http_error(429, {'Retry-After': value})), value)
+
+    def test_missing_header(self):
+        self.assertIsNone(get_retry_after(http_error(429)))
+        self.assertIsNone(get_retry_after(http_error(429, {'Content-Type': 'text/html'})))
+
+    def test_other_errors(self):
+        self.assertIsNone(get_retry_after(aiohttp.ClientConnectionError()))
+        self.assertIsNone(get_retry_after(asyncio.TimeoutError()))
+
+if __name__ == '__main__':
+    unittest.main()
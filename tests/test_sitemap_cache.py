@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.utils import sitemap_parser
+from modules.utils.sitemap_cache import SitemapCache
+from modules.utils.http_session import close_http_session
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{base}/sub.xml</loc></sitemap>
+</sitemapindex>"""
+
+SUB_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{base}/{version}/a</loc></url>
+  <url><loc>{base}/{version}/b</loc></url>
+</urlset>"""
+
+class TestSitemapCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SitemapCache(self.temp_dir)
+        patcher = patch.object(sitemap_parser, 'sitemap_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # The sub-sitemap's content and ETag change whenever the version changes
+        self.version = 'v1'
+        self.statuses = []
+        app = web.Application()
+        app.router.add_get('/sitemap.xml', self.serve_index)
+        app.router.add_get('/sub.xml', self.serve_sub)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.base = str(self.server.make_url('')).rstrip('/')
+
+    async def asyncTearDown(self):
+        await close_http_session()
+        await self.server.close()
+        shutil.rmtree(self.temp_dir)
+
+    def respond(self, request, etag, body):
+        if request.method == 'GET':
+            status = 304 if request.headers.get('If-None-Match') == etag else 200
+            self.statuses.append((request.path, status))
+            if status == 304:
+                return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body.encode('utf-8'), content_type='application/xml', headers={'ETag': etag})
+
+    async def serve_index(self, request):
+        return self.respond(request, '"index"', SITEMAP_INDEX.format(base=self.base))
+
+    async def serve_sub(self, request):
+        return self.respond(request, f'"{self.version}"', SUB_SITEMAP.format(base=self.base, version=self.version))
+
+    def read_index(self):
+        with open(self.cache.index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    async def test_not_modified_reuses_cached_body(self):
+        first = await sitemap_parser.get_all_urls(self.base)
+        self.assertEqual(first, [f"{self.base}/v1/a", f"{self.base}/v1/b"])
+        self.assertEqual(self.statuses, [('/sitemap.xml', 200), ('/sub.xml', 200)])
+
+        self.statuses.clear()
+        second = await sitemap_parser.get_all_urls(self.base)
+        self.assertEqual(second, first)
+        self.assertEqual(self.statuses, [('/sitemap.xml', 304), ('/sub.xml', 304)])
+
+    async def test_changed_sitemap_rewrites_cache(self):
+        await sitemap_parser.get_all_urls(self.base)
+        sub_url = f"{self.base}/sub.xml"
+        self.assertEqual(self.read_index()[sub_url]['etag'], '"v1"')
+
+        self.version = 'v2'
+        self.statuses.clear()
+        urls = await sitemap_parser.get_all_urls(self.base)
+        self.assertEqual(urls, [f"{self.base}/v2/a", f"{self.base}/v2/b"])
+        self.assertEqual(self.statuses, [('/sitemap.xml', 304), ('/sub.xml', 200)])
+        self.assertEqual(self.read_index()[sub_url]['etag'], '"v2"')
+        with open(self.cache.body_path(sub_url), 'rb') as f:
+            self.assertIn(b"/v2/a", f.read())
+        self.assertFalse(os.path.exists(self.cache.body_path(sub_url) + '.part'))
+
+if __name__ == '__main__':
+    unittest.main()
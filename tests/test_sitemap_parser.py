@@ -0,0 +1,122 @@
+import io
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+from lxml import etree
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.utils import sitemap_parser
+from modules.utils.sitemap_parser import collect_locs, iter_sitemap_locs, parse_sitemap_xml
+
+BASE_URL = "https://example.com"
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc> https://example.com/a </loc><lastmod>2024-01-01</lastmod></url>
+  <url><loc>https://example.com/b</loc></url>
+  <url><loc></loc></url>
+  <url><loc>https://other.com/c</loc></url>
+</urlset>"""
+
+SITEMAPINDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/sitemap-posts.xml</loc></sitemap>
+  <sitemap><loc>https://example.com/sitemap-pages.xml</loc></sitemap>
+</sitemapindex>"""
+
+# Nested entities expand to 100 URLs' worth of text if entities are resolved
+ENTITY_EXPANSION = b"""<?xml version="1.0"?>
+<!DOCTYPE urlset [
+  <!ENTITY a "https://example.com/expanded">
+  <!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">
+  <!ENTITY c "&b;&b;&b;&b;&b;&b;&b;&b;&b;&b;">
+]>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>&c;</loc></url>
+  <url><loc>https://example.com/a</loc></url>
+</urlset>"""
+
+MALFORMED = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/a</loc></url>
+  <url><loc>https://example.com/b</url>
+</urlset>"""
+
+class TestIterSitemapLocs(unittest.TestCase):
+
+    def test_namespaced_urlset(self):
+        self.assertEqual(
+            list(iter_sitemap_locs(io.BytesIO(URLSET))),
+            ["https://example.com/a", "https://example.com/b", "https://other.com/c"],
+        )
+
+    def test_sitemapindex(self):
+        self.assertEqual(
+            list(iter_sitemap_locs(io.BytesIO(SITEMAPINDEX))),
+            ["https://example.com/sitemap-posts.xml", "https://example.com/sitemap-pages.xml"],
+        )
+
+    def test_without_namespace(self):
+        xml = b"<urlset><url><loc>https://example.com/a</loc></url></urlset>"
+        self.assertEqual(list(iter_sitemap_locs(io.BytesIO(xml))), ["https://example.com/a"])
+
+    def test_entities_are_not_expanded(self):
+        self.assertEqual(list(iter_sitemap_locs(io.BytesIO(ENTITY_EXPANSION))), ["https://example.com/a"])
+
+    def test_malformed_xml_raises(self):
+        with self.assertRaises(etree.XMLSyntaxError):
+            list(iter_sitemap_locs(io.BytesIO(MALFORMED)))
+
+class TestCollectLocs(unittest.TestCase):
+
+    def test_pull_parser_fed_in_chunks(self):
+        parser = etree.XMLPullParser(events=('end',), tag='{*}loc', resolve_entities=False)
+        locs = []
+        for i in range(0, len(URLSET), 16):
+            parser.feed(URLSET[i:i + 16])
+            locs.extend(collect_locs(parser.read_events()))
+        parser.close()
+        locs.extend(collect_locs(parser.read_events()))
+        self.assertEqual(locs, ["https://example.com/a", "https://example.com/b", "https://other.com/c"])
+
+    def test_discards_finished_entries(self):
+        events = etree.iterparse(io.BytesIO(URLSET), events=('end',), tag='{*}loc')
+        for _ in collect_locs(events):
+            pass
+        # Only the last <url> entry is left, with its <loc> cleared
+        root = events.root
+        self.assertEqual(len(root), 1)
+        self.assertIsNone(root[0][0].text)
+
+class TestParseSitemapXml(unittest.IsolatedAsyncioTestCase):
+
+    async def test_keeps_urls_on_base_domain(self):
+        urls = await parse_sitemap_xml(URLSET, BASE_URL)
+        self.assertEqual(urls, {"https://example.com/a", "https://example.com/b"})
+
+    async def test_accepts_str_content(self):
+        urls = await parse_sitemap_xml(URLSET.decode('utf-8').split('?>', 1)[1], BASE_URL)
+        self.assertEqual(urls, {"https://example.com/a", "https://example.com/b"})
+
+    async def test_sitemapindex_fetches_sub_sitemaps(self):
+        sub_urls = {
+            "https://example.com/sitemap-posts.xml": {"https://example.com/post"},
+            "https://example.com/sitemap-pages.xml": {"https://example.com/page"},
+        }
+        parse_sub_sitemap = AsyncMock(side_effect=lambda url, base_url: sub_urls[url])
+        with patch.object(sitemap_parser, 'parse_sub_sitemap', parse_sub_sitemap):
+            urls = await parse_sitemap_xml(SITEMAPINDEX, BASE_URL)
+        self.assertEqual(urls, {"https://example.com/post", "https://example.com/page"})
+        self.assertEqual(parse_sub_sitemap.await_count, 2)
+
+    async def test_entity_expansion_payload(self):
+        urls = await parse_sitemap_xml(ENTITY_EXPANSION, BASE_URL)
+        self.assertEqual(urls, {"https://example.com/a"})
+
+    async def test_malformed_xml(self):
+        self.assertEqual(await parse_sitemap_xml(MALFORMED, BASE_URL), set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.processors.url_processor import (
+    classify_url, is_suspicious_url, normalize_and_filter_urls, normalize_url, url_fingerprint
+)
+
+BASE_URL = "https://example.com"
+
+class TestNormalizeUrl(unittest.TestCase):
+
+    def test_lowercases_scheme_and_host_only(self):
+        self.assertEqual(normalize_url("HTTPS://Example.COM/Docs/ReadMe"), "https://example.com/Docs/ReadMe")
+
+    def test_keeps_path_case(self):
+        self.assertNotEqual(normalize_url(f"{BASE_URL}/Page"), normalize_url(f"{BASE_URL}/page"))
+
+    def test_strips_trailing_slashes(self):
+        test_cases = [
+            (f"{BASE_URL}/", BASE_URL),
+            (f"{BASE_URL}/docs/", f"{BASE_URL}/docs"),
+            (f"{BASE_URL}/docs//", f"{BASE_URL}/docs"),
+        ]
+        for url, expected in test_cases:
+            self.assertEqual(normalize_url(url), expected, url)
+
+    def test_drops_query_and_fragment(self):
+        self.assertEqual(normalize_url(f"{BASE_URL}/docs?page=2#intro"), f"{BASE_URL}/docs")
+
+    def test_defaults_to_https(self):
+        self.assertEqual(normalize_url("//example.com/docs"), f"{BASE_URL}/docs")
+
+    def test_drops_default_ports_only(self):
+        test_cases = [
+            ("https://example.com:443/docs", "https://example.com/docs"),
+            ("http://Example.com:80/docs", "http://example.com/docs"),
+            ("http://example.com:443/docs", "http://example.com:443/docs"),
+            ("https://example.com:8443/docs", "https://example.com:8443/docs"),
+        ]
+        for url, expected in test_cases:
+            self.assertEqual(normalize_url(url), expected, url)
+
+class TestNormalizeAndFilterUrls(unittest.TestCase):
+
+    def test_matches_normalize_url(self):
+        urls = [f"{BASE_URL}/A/", "HTTPS://EXAMPLE.COM/b?x=1", "https://example.com:443/c"]
+        self.assertEqual(normalize_and_filter_urls(urls, BASE_URL), {normalize_url(url) for url in urls})
+
+    def test_deduplicates_variants(self):
+        urls = [f"{BASE_URL}/docs", f"{BASE_URL}/docs/", f"{BASE_URL}/docs#top", "https://EXAMPLE.com/docs"]
+        self.assertEqual(normalize_and_filter_urls(urls, BASE_URL), {f"{BASE_URL}/docs"})
+
+    def test_drops_other_hosts(self):
+        urls = [
+            "https://other.com/docs",
+            "https://sub.example.com/docs",
+            "https://example.com.evil.org/docs",
+            "https://example.com:8443/docs",
+        ]
+        self.assertEqual(normalize_and_filter_urls(urls, BASE_URL), set())
+
+    def test_keeps_only_urls_under_base_path(self):
+        base_url = f"{BASE_URL}/docs"
+        urls = [f"{BASE_URL}/docs", f"{BASE_URL}/docs/intro", f"{BASE_URL}/docs-old/intro", f"{BASE_URL}/blog/post"]
+        self.assertEqual(normalize_and_filter_urls(urls, base_url), {f"{BASE_URL}/docs", f"{BASE_URL}/docs/intro"})
+
+class TestClassifyUrl(unittest.TestCase):
+
+    def test_normalizes_like_normalize_url(self):
+        for url in ("HTTPS://Example.COM/Docs/", "https://example.com:443/a?itemId=1", "//example.com/b#c"):
+            self.assertEqual(classify_url(url, BASE_URL)[0], normalize_url(url), url)
+
+    def test_internal_urls(self):
+        for url in (BASE_URL, f"{BASE_URL}/", f"{BASE_URL}/docs", "https://EXAMPLE.com:443/docs"):
+            self.assertTrue(classify_url(url, BASE_URL)[1], url)
+
+    def test_external_host_sharing_base_prefix(self):
+        for url in ("https://example.com.evil.org/docs", "https://example.company.com/docs", "https://example.com:8443/docs"):
+            self.assertFalse(classify_url(url, BASE_URL)[1], url)
+
+    def test_path_sharing_base_prefix(self):
+        base_url = f"{BASE_URL}/docs"
+        self.assertTrue(classify_url(f"{BASE_URL}/docs/intro", base_url)[1])
+        self.assertFalse(classify_url(f"{BASE_URL}/docs-old/intro", base_url)[1])
+
+    def test_suspicious_matches_is_suspicious_url(self):
+        test_cases = [
+            (f"{BASE_URL}/gallery?itemId=3", True),
+            (f"{BASE_URL}/gallery?page=2&imageId=3", True),
+            (f"{BASE_URL}/photo.JPG", True),
+            (f"{BASE_URL}/gallery?page=2", False),
+            (f"{BASE_URL}/docs", False),
+        ]
+        for url, expected in test_cases:
+            self.assertEqual(classify_url(url, BASE_URL)[2], expected, url)
+            self.assertEqual(is_suspicious_url(url), expected, url)
+
+class TestUrlFingerprint(unittest.TestCase):
+
+    def test_identifier_segments(self):
+        test_cases = [
+            ("/item/123e4567-e89b-12d3-a456-426614174000", "/item/{uuid}"),
+            ("/item/123E4567-E89B-12D3-A456-426614174000", "/item/{uuid}"),
+            ("/item/01ARZ3NDEKTSV4RRFFQ69G5FAV", "/item/{ulid}"),
+            ("/item/" + "a1" * 12, "/item/{hash}"),
+            ("/item/" + "b2" * 16, "/item/{hash}"),
+            ("/item/" + "c3" * 20, "/item/{hash}"),
+            ("/item/" + "d4" * 32, "/item/{hash}"),
+            ("/item/42", "/item/{id}"),
+            ("/user/42/posts/7", "/user/{id}/posts/{id}"),
+        ]
+        for path, expected in test_cases:
+            self.assertEqual(url_fingerprint(f"{BASE_URL}{path}"), f"{BASE_URL}{expected}", path)
+
+    def test_same_template_shares_fingerprint(self):
+        self.assertEqual(url_fingerprint(f"{BASE_URL}/user/42/profile"), url_fingerprint(f"{BASE_URL}/user/97/profile"))
+
+    def test_other_segments_unchanged(self):
+        for path in ("/docs/getting-started", "/v2/api", "/item/" + "a1" * 13, "/item/deadbeef", ""):
+            self.assertEqual(url_fingerprint(f"{BASE_URL}{path}"), f"{BASE_URL}{path}", path)
+
+    def test_keeps_scheme_and_host(self):
+        self.assertEqual(url_fingerprint("http://example.com:8080/item/42"), "http://example.com:8080/item/{id}")
+
+if __name__ == '__main__':
+    unittest.main()
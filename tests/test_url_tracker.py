@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.utils.url_tracker import URLTracker
+
+BASE_URL = "https://example.com"
+
+class TestPoolDeduplication(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = URLTracker()
+
+    def test_queued_url_is_not_added_again(self):
+        self.tracker.add_to_pool(f"{BASE_URL}/a")
+        self.tracker.add_to_pool(f"{BASE_URL}/a")
+        self.tracker.add_bulk_to_pool({f"{BASE_URL}/a", f"{BASE_URL}/b"})
+        self.assertEqual(list(self.tracker.url_pool), [f"{BASE_URL}/a", f"{BASE_URL}/b"])
+
+    def test_visited_url_is_not_added(self):
+        self.tracker.mark_visited(f"{BASE_URL}/a")
+        self.tracker.add_to_pool(f"{BASE_URL}/a")
+        self.tracker.add_bulk_to_pool({f"{BASE_URL}/a"})
+        self.assertTrue(self.tracker.is_pool_empty())
+
+    def test_bulk_add_keeps_batch_order_without_duplicates(self):
+        self.tracker.add_bulk_to_pool([f"{BASE_URL}/b", f"{BASE_URL}/a", f"{BASE_URL}/b"])
+        self.assertEqual(list(self.tracker.url_pool), [f"{BASE_URL}/b", f"{BASE_URL}/a"])
+
+    def test_clear_pool_allows_requeueing(self):
+        self.tracker.add_to_pool(f"{BASE_URL}/a")
+        self.tracker.clear_pool()
+        self.tracker.add_to_pool(f"{BASE_URL}/a")
+        self.assertEqual(self.tracker.get_pool_size(), 1)
+
+class TestInProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = URLTracker()
+        self.tracker.add_bulk_to_pool([f"{BASE_URL}/a", f"{BASE_URL}/b"])
+
+    def test_in_progress_url_is_not_added_again(self):
+        url = self.tracker.get_next_url()
+        self.tracker.add_to_pool(url)
+        self.tracker.add_bulk_to_pool({url})
+        self.assertEqual(list(self.tracker.url_pool), [f"{BASE_URL}/b"])
+
+    def test_finish_url_decrements_in_progress_count(self):
+        first = self.tracker.get_next_url()
+        second = self.tracker.get_next_url()
+        self.assertEqual(self.tracker.get_in_progress_count(), 2)
+        self.tracker.finish_url(first)
+        self.assertEqual(self.tracker.get_in_progress_count(), 1)
+        self.tracker.finish_url(second)
+        self.assertEqual(self.tracker.get_in_progress_count(), 0)
+
+    def test_finished_and_visited_url_is_not_added_again(self):
+        url = self.tracker.get_next_url()
+        self.tracker.mark_visited(url)
+        self.tracker.finish_url(url)
+        self.tracker.add_to_pool(url)
+        self.assertEqual(list(self.tracker.url_pool), [f"{BASE_URL}/b"])
+
+    def test_empty_pool(self):
+        self.tracker.clear_pool()
+        self.assertIsNone(self.tracker.get_next_url())
+        self.assertEqual(self.tracker.get_in_progress_count(), 0)
+
+class TestClaimFingerprint(unittest.TestCase):
+
+    def test_only_first_claim_succeeds(self):
+        tracker = URLTracker()
+        self.assertTrue(tracker.claim_fingerprint(f"{BASE_URL}/user/{{id}}"))
+        self.assertFalse(tracker.claim_fingerprint(f"{BASE_URL}/user/{{id}}"))
+        self.assertTrue(tracker.claim_fingerprint(f"{BASE_URL}/post/{{id}}"))
+
+if __name__ == '__main__':
+    unittest.main()